@@ -0,0 +1,120 @@
+"""Admission control for endpoints that run the engine.
+
+Two layers, checked in order before any engine work:
+
+- token buckets per client address and per game, refilled continuously;
+  an empty bucket is a 429 with Retry-After. Every request spends a client
+  token; only requests that will run the engine spend a game token, so a
+  crowd of viewers reading a coalesced tick does not throttle its game.
+  Starting a game has no game to charge, only its client and a slot
+- a fixed number of engine slots with a short bounded queue in front; when
+  the queue is full, or a queued request waits longer than its timeout,
+  the request is a 503 rather than piling up behind the others
+
+Both fail fast, so well-behaved viewers keep their latency when one client
+(or a stuck tab) hammers the server.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from config import (ADMISSION_ENABLED, CLIENT_RATE, CLIENT_BURST, GAME_RATE, GAME_BURST,
+                    ENGINE_SLOTS, ENGINE_QUEUE, ENGINE_QUEUE_TIMEOUT)
+
+
+class RateLimiter:
+    """Token bucket per key; at most max_keys buckets, least recently used dropped first."""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key -> [tokens, updated_at]
+        self._lock = threading.Lock()
+
+    def take(self, key) -> float:
+        """Spend one token; 0.0 when allowed, else seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / self.rate
+
+
+class EngineSlots:
+    """At most `slots` engine operations at once, at most `queue` more waiting."""
+
+    def __init__(self, slots: int, queue: int, timeout: float):
+        self.timeout = timeout
+        self.capacity = slots + queue
+        self._sem = threading.BoundedSemaphore(slots)
+        self._admitted = 0          # running + waiting
+        self._lock = threading.Lock()
+
+    def acquire(self) -> str | None:
+        """None once a slot is held, else the rejection reason."""
+        with self._lock:
+            if self._admitted >= self.capacity:
+                return "queue_full"
+            self._admitted += 1
+        if self._sem.acquire(timeout=self.timeout):
+            return None
+        with self._lock:
+            self._admitted -= 1
+        return "queue_timeout"
+
+    def release(self):
+        self._sem.release()
+        with self._lock:
+            self._admitted -= 1
+
+    @property
+    def in_flight(self) -> int:
+        return self._admitted
+
+
+class Admission:
+    def __init__(self, enabled: bool = ADMISSION_ENABLED):
+        self.enabled = enabled
+        self.clients = RateLimiter(CLIENT_RATE, CLIENT_BURST)
+        self.games = RateLimiter(GAME_RATE, GAME_BURST)
+        self.slots = EngineSlots(ENGINE_SLOTS, ENGINE_QUEUE, ENGINE_QUEUE_TIMEOUT)
+
+    def check(self, client: str, game: str | None, work: bool = True) -> tuple | None:
+        """None when admitted, else (status, reason, retry_after).
+
+        work=False is a request that will not run the engine (a coalesced
+        tick): it spends only a client token, and takes no slot to release().
+        game=None (new_game) skips the game bucket.
+        Admitted work must release().
+        """
+        if not self.enabled:
+            return None
+        wait = self.clients.take(client)
+        if wait:
+            return 429, "client_rate", math.ceil(wait)
+        if not work:
+            return None
+        wait = self.games.take(game) if game is not None else 0.0
+        if wait:
+            return 429, "game_rate", math.ceil(wait)
+        reason = self.slots.acquire()
+        if reason:
+            return 503, reason, 1
+        return None
+
+    def release(self):
+        if self.enabled:
+            self.slots.release()
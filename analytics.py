@@ -0,0 +1,81 @@
+"""Streaming per-bot risk statistics.
+
+RiskStats is fed one net-worth sample per round (the same samples as
+net_worth_history) plus every executed trade, and keeps everything needed for
+the summary in O(1): Welford mean/variance of round returns, the sum of
+squared downside returns for Sortino, the running peak and worst drawdown,
+and traded notional. Nothing rescans history.
+"""
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class RiskStats:
+    last: float                     # net worth at the previous sample
+    peak: float = 0.0
+    n: int = 0                      # returns seen
+    mean: float = 0.0
+    m2: float = 0.0                 # Welford sum of squared deviations
+    downside_sq: float = 0.0        # sum of min(r, 0)^2
+    max_drawdown: float = 0.0       # worst peak-to-trough fall, as a fraction of the peak
+    drawdown: float = 0.0           # current fall from the peak
+    turnover: float = 0.0           # traded notional, buys + sells
+
+    def __post_init__(self):
+        self.peak = max(self.peak, self.last)
+
+    def record(self, net_worth: float):
+        """Fold in one net-worth sample."""
+        if self.last > 0:
+            r = net_worth / self.last - 1.0
+            self.n += 1
+            delta = r - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (r - self.mean)
+            if r < 0:
+                self.downside_sq += r * r
+        self.last = net_worth
+        if net_worth > self.peak:
+            self.peak = net_worth
+        self.drawdown = 1.0 - net_worth / self.peak if self.peak > 0 else 0.0
+        if self.drawdown > self.max_drawdown:
+            self.max_drawdown = self.drawdown
+
+    def trade(self, notional: float):
+        self.turnover += notional
+
+    @property
+    def volatility(self) -> float:
+        """Sample standard deviation of per-round returns."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    @property
+    def sharpe(self) -> float:
+        """Per-round mean return over its volatility (zero risk-free rate, not annualized)."""
+        vol = self.volatility
+        return self.mean / vol if vol > 0 else 0.0
+
+    @property
+    def sortino(self) -> float:
+        downside = math.sqrt(self.downside_sq / self.n) if self.n else 0.0
+        return self.mean / downside if downside > 0 else 0.0
+
+    def summary(self, starting_cash: float) -> dict:
+        return {
+            "mean_return": round(self.mean, 5),
+            "volatility": round(self.volatility, 5),
+            "sharpe": round(self.sharpe, 3),
+            "sortino": round(self.sortino, 3),
+            "drawdown": round(self.drawdown, 4),
+            "max_drawdown": round(self.max_drawdown, 4),
+            "turnover": round(self.turnover / starting_cash, 3),   # multiples of starting cash
+        }
+
+
+def exposure(bot, net_worth: float) -> dict:
+    """Share of net worth held in each asset."""
+    if net_worth <= 0:
+        return {}
+    return {a.symbol: round(bot.holding(a) * a.price / net_worth, 4) for a in bot.held}
@@ -1,11 +1,93 @@
 """Flask server for Trading Bot Wars."""
 
-from flask import Flask, jsonify, render_template
+import functools
+import hashlib
+import hmac
+import json
+import sys
+
+from flask import Flask, Response, abort, g, jsonify, render_template, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+from admission import Admission
+from config import (ADMIN_TOKEN, PROFILER_ENABLED, PROXY_HOPS, POPULATION_MAX, ADVANCE_MAX_TICKS, STATE_MAX_AGE,
+                    FORECAST_PATHS, FORECAST_MAX_PATHS, FORECAST_STEPS, FORECAST_MAX_STEPS)
 from engine import GameEngine
+from forecast import simulate
 from prices import fetch_prices
+from series import original_length
+from session import SessionRegistry
+from store import get_store
+import metrics
+import plugins
+import profiler
 
 app = Flask(__name__)
-game_engine = GameEngine()
+if PROXY_HOPS:
+    # remote_addr becomes the client, not the proxy, before admission keys on it
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS)
+results_store = sessions = admission = None     # set by bootstrap()
+
+
+def bootstrap():
+    """Per-process server state: store writer, first game, admission control.
+
+    Spawned odds and plugin workers import this module as __mp_main__ and
+    skip it; they need none of it (and a live price fetch per worker).
+    """
+    global results_store, sessions, admission
+    if PROFILER_ENABLED:
+        profiler.enable()
+    results_store = get_store()
+    sessions = SessionRegistry(results_store)
+    sessions.start(GameEngine())
+    admission = Admission()
+
+
+if __name__ != "__mp_main__":
+    bootstrap()
+
+
+def _session():
+    """The game named by ?game=, else the current one; None when the named game is gone."""
+    return sessions.get(request.args.get("game"))
+
+
+def admitted(endpoint: str, runs_engine=None):
+    """Rate-limit and queue an engine-running route; rejects with 429/503 before any engine work.
+
+    runs_engine(), when given, says whether this request will run the engine
+    at all; g.runs_engine carries the answer to the view, which must not run
+    the engine when it is False (only the client bucket was charged).
+    """
+    def wrap(view):
+        @functools.wraps(view)
+        def guarded(*args, **kwargs):
+            # new_game has no game yet: its client bucket and a slot bound it
+            game = None if endpoint == "new_game" else request.args.get("game") or (
+                sessions.current.game_id if sessions.current else "")
+            g.runs_engine = work = runs_engine is None or runs_engine()
+            rejected = admission.check(request.remote_addr or "", game, work)
+            if rejected:
+                status, reason, retry_after = rejected
+                metrics.inc("admission_rejected_total", endpoint=endpoint, reason=reason)
+                resp = jsonify({"error": "busy" if status == 503 else "rate limited", "reason": reason})
+                resp.status_code = status
+                resp.headers["Retry-After"] = str(retry_after)
+                return resp
+            try:
+                return view(*args, **kwargs)
+            finally:
+                if work:
+                    admission.release()
+        return guarded
+    return wrap
+
+
+def _require_admin():
+    """404 unless ADMIN_TOKEN is configured and supplied via X-Admin-Token or ?token=."""
+    supplied = request.headers.get("X-Admin-Token") or request.args.get("token", "")
+    if not ADMIN_TOKEN or not hmac.compare_digest(supplied, ADMIN_TOKEN):
+        abort(404)
 
 
 @app.route("/")
@@ -14,27 +96,333 @@ def index():
 
 
 @app.route("/api/new_game", methods=["POST"])
+@admitted("new_game")
 def new_game():
-    global game_engine
-    game_engine = GameEngine()
-    return jsonify({"status": "ok"})
+    body = request.get_json(silent=True) or {}
+    population = body.get("population")
+    if population is not None:
+        try:
+            population = int(population)
+        except (TypeError, ValueError):
+            population = 0
+        if not 1 <= population <= POPULATION_MAX:
+            return jsonify({"error": f"population must be an integer from 1 to {POPULATION_MAX}"}), 400
+    # "plugins": ["meanrev", ...] seats a bot per uploaded strategy (see /admin/plugins)
+    wanted = body.get("plugins") or []
+    if not isinstance(wanted, list):
+        return jsonify({"error": "plugins must be a list of names"}), 400
+    missing = sorted(set(map(str, wanted)) - set(plugins.available()))
+    if missing:
+        return jsonify({"error": "unknown plugins", "plugins": missing}), 400
+    if wanted:
+        plugins.pool().warm()
+    # The previous game stays registered for ?game= viewers until enforce()
+    # evicts it as idle or over the memory budget
+    session = sessions.start(GameEngine(population=population, plugin_names=wanted))
+    sessions.enforce(force=True)
+    metrics.inc("http_requests_total", endpoint="new_game")
+    return jsonify({"status": "ok", "game_id": session.game_id})
+
+
+def _tick_id() -> int | None:
+    """?tick_id= or X-Tick-Id: the tick the client wants to see."""
+    tick_id = request.args.get("tick_id", type=int)
+    if tick_id is None and request.headers.get("X-Tick-Id", "").isdigit():
+        tick_id = int(request.headers["X-Tick-Id"])
+    return tick_id
+
+
+def _tick_due() -> bool:
+    session = _session()
+    return session is not None and session.due(_tick_id())
 
 
 @app.route("/api/tick", methods=["POST"])
+@admitted("tick", runs_engine=_tick_due)
 def tick():
-    global game_engine
-    if game_engine is None:
-        game_engine = GameEngine()
-    state = game_engine.tick()
-    return jsonify(state)
+    """Advance the game one sub-tick, coalesced per TICK_WINDOW_SECONDS.
+
+    ?tick_id= (or X-Tick-Id) is the tick the client wants to see; once the
+    game has reached it, retries get the same state back without advancing.
+    """
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    # ?assets=BTC,ETH subscribes to a subset of the universe
+    subset = request.args.get("assets")
+    body, advanced = session.tick(assets=subset.upper().split(",") if subset else None,
+                                  width=request.args.get("width", type=int), tick_id=_tick_id(),
+                                  advance=g.runs_engine)
+    if advanced:
+        sessions.enforce()
+    resp = Response(body, mimetype="application/json")
+    resp.headers["X-Coalesced"] = "0" if advanced else "1"
+    if metrics.enabled:
+        metrics.inc("http_requests_total", endpoint="tick")
+        metrics.observe("response_bytes", len(body), endpoint="tick")
+    return resp
+
+
+@app.route("/api/state")
+def state():
+    """Latest state without advancing (?game=, ?assets=, ?width= as for /api/tick).
+
+    The encoded body (and its gzip form) is built once per tick and shared by
+    every reader; the ETag names the game, tick and variant, so shared caches
+    can hold it for STATE_MAX_AGE and revalidate cheaply after that.
+    """
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    subset = request.args.get("assets")
+    encoding = "gzip" if request.accept_encodings["gzip"] else None
+    body, etag = session.state(assets=subset.upper().split(",") if subset else None,
+                               width=request.args.get("width", type=int), encoding=encoding)
+    metrics.inc("http_requests_total", endpoint="state")
+    if etag in request.if_none_match:
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        metrics.observe("response_bytes", len(body), endpoint="state")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = f"public, max-age={STATE_MAX_AGE}"
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+@app.route("/api/advance", methods=["POST"])
+@admitted("advance")
+def advance():
+    """Fast-forward ?ticks=N sub-ticks (max ADVANCE_MAX_TICKS) and return {summary, state}.
+
+    Takes the same ?assets=, ?width= and ?tick_id= as /api/tick; with tick_id
+    the game never goes past that tick, so a retried catch-up is a no-op.
+    Admin-only: games are shared, and this skips the tick window every viewer
+    is paced by.
+    """
+    _require_admin()
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    ticks = request.args.get("ticks", type=int)
+    if ticks is None or ticks < 1:
+        return jsonify({"error": "ticks must be a positive integer"}), 400
+    subset = request.args.get("assets")
+    state, summary = session.advance(min(ticks, ADVANCE_MAX_TICKS),
+                                     assets=subset.upper().split(",") if subset else None,
+                                     width=request.args.get("width", type=int),
+                                     tick_id=request.args.get("tick_id", type=int))
+    sessions.enforce()
+    # Splice the cached state bytes in rather than decoding and re-encoding them
+    body = b'{"summary":' + json.dumps(summary, separators=(",", ":")).encode() + b',"state":' + state + b"}"
+    if metrics.enabled:
+        metrics.inc("http_requests_total", endpoint="advance")
+        metrics.observe("response_bytes", len(body), endpoint="advance")
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/api/series")
+def series():
+    """Chart data sized for the client: ?asset=BTC&width=300&kind=line|ohlc."""
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    symbol = request.args.get("asset", "").upper()
+    if symbol not in session.engine.assets:
+        return jsonify({"error": "unknown asset"}), 404
+    width = max(3, min(request.args.get("width", 300, type=int), 5000))
+    kind = request.args.get("kind", "line")
+    if kind not in ("line", "ohlc"):
+        return jsonify({"error": "kind must be line or ohlc"}), 400
+    with session.lock:
+        data = session.engine.series(symbol, width, kind)
+    return jsonify(data)
+
+
+@app.route("/api/history")
+def history():
+    """Slice of a price (?asset=) or net-worth (?bot=) series: &from=&to=&step=&format=json|f64.
+
+    History is append-only, so when the request pins ?game= and the range is
+    fully recorded it gets a strong ETag and immutable caching; the live tail
+    (no ?to=, or ?to= past the end) is served no-cache. Positions are always
+    uncompacted ones; a range reaching into a compacted head is 410.
+    """
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    engine = session.engine
+    game = request.args.get("game")
+    asset, bot = request.args.get("asset"), request.args.get("bot")
+    if bool(asset) == bool(bot):
+        return jsonify({"error": "pass exactly one of asset or bot"}), 400
+    found = engine.history_buffer(asset=asset.upper() if asset else None, bot=bot)
+    if found is None:
+        return jsonify({"error": "unknown series"}), 404
+    buf, index = found
+
+    with session.lock:
+        length = original_length(buf, index)
+        compacted = index[-1] + 1 if index else 0
+    start = max(0, request.args.get("from", 0, type=int))
+    stop = request.args.get("to", type=int)
+    step = max(1, request.args.get("step", 1, type=int))
+    final = bool(game) and stop is not None and stop <= length
+    stop = length if stop is None else max(start, min(stop, length))
+    metrics.inc("http_requests_total", endpoint="history")
+    if start < compacted:
+        return jsonify({"error": "range compacted", "compacted_until": compacted}), 410
+
+    etag = None
+    if final:
+        key = f"{engine.game_id}|{asset or ''}|{bot or ''}|{start}|{stop}|{step}|{request.args.get('format', 'json')}"
+        etag = hashlib.blake2s(key.encode(), digest_size=12).hexdigest()
+        if etag in request.if_none_match:
+            resp = Response(status=304)
+            resp.set_etag(etag)
+            resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            return resp
+
+    with session.lock:
+        # Compaction may have run since the check above
+        compacted = index[-1] + 1 if index else 0
+        if start < compacted:
+            return jsonify({"error": "range compacted", "compacted_until": compacted}), 410
+        shift = compacted - len(index)
+        values = buf[start - shift:stop - shift:step]
+    if request.args.get("format") == "f64":
+        # Raw little-endian float64s, straight from the buffer
+        if sys.byteorder != "little":
+            values.byteswap()
+        resp = Response(values.tobytes(), mimetype="application/octet-stream")
+        resp.headers["X-History-Length"] = str(length)
+    else:
+        resp = jsonify({"game_id": engine.game_id, "from": start, "to": stop, "step": step,
+                        "length": length, "values": values.tolist()})
+    if etag:
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+@app.route("/api/forecast")
+def forecast():
+    """Monte-Carlo percentile bands: ?paths=10000&steps=100&assets=BTC,ETH&seed=."""
+    paths = max(2, min(request.args.get("paths", FORECAST_PATHS, type=int), FORECAST_MAX_PATHS))
+    steps = max(1, min(request.args.get("steps", FORECAST_STEPS, type=int), FORECAST_MAX_STEPS))
+    subset = request.args.get("assets")
+    session = _session()
+    if session is None:
+        return jsonify({"error": "game no longer running"}), 410
+    metrics.inc("http_requests_total", endpoint="forecast")
+    with session.lock:
+        bands = simulate(session.engine, subset.upper().split(",") if subset else None, paths, steps,
+                         seed=request.args.get("seed", type=int))
+    return jsonify(bands)
+
+
+@app.route("/api/stats/<view>")
+def stats(view):
+    """Cross-game history: leaderboard, personalities, or awards (?award=champion)."""
+    if not results_store:
+        return jsonify({"error": "results store disabled"}), 404
+    if view == "leaderboard":
+        return jsonify(results_store.leaderboard(min(request.args.get("limit", 25, type=int), 500)))
+    if view == "personalities":
+        return jsonify(results_store.personality_win_rates())
+    if view == "awards":
+        return jsonify(results_store.award_history(request.args.get("award"),
+                                                   min(request.args.get("limit", 50, type=int), 500)))
+    abort(404)
 
 
 @app.route("/api/prices")
 def live_prices():
     """Return real-time prices from CoinGecko (cached 5s)."""
     prices = fetch_prices()
+    metrics.inc("http_requests_total", endpoint="prices")
     return jsonify(prices)
 
 
+@app.route("/api/metrics")
+def metrics_endpoint():
+    """Prometheus scrape target; 404 unless METRICS_ENABLED=1."""
+    if not metrics.enabled:
+        return jsonify({"error": "metrics disabled"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/admin/profile")
+def admin_profile():
+    """Aggregated collapsed stacks from the sampling profiler (flamegraph.pl input)."""
+    _require_admin()
+    body = profiler.sampler.folded()
+    if request.args.get("reset") == "1":
+        profiler.sampler.reset()
+    return Response(body, mimetype="text/plain",
+                    headers={"Content-Disposition": "attachment; filename=profile.folded"})
+
+
+@app.route("/admin/slow_ticks")
+def admin_slow_ticks():
+    _require_admin()
+    return jsonify({
+        "budget_ms": profiler.slow_ticks.budget * 1000,
+        "sampling": profiler.sampler.running,
+        "ticks": profiler.slow_ticks.summary(),
+    })
+
+
+@app.route("/admin/slow_ticks/<int:tick_id>.folded")
+def admin_slow_tick_stacks(tick_id):
+    _require_admin()
+    body = profiler.slow_ticks.folded(tick_id)
+    if body is None:
+        abort(404)
+    return Response(body, mimetype="text/plain",
+                    headers={"Content-Disposition": f"attachment; filename=slow_tick_{tick_id}.folded"})
+
+
+@app.route("/admin/memory")
+def admin_memory():
+    """Per-game memory estimates plus a tracemalloc top-N: ?top=25&group=lineno|filename|traceback&diff=1.
+
+    The first call starts tracing; ?stop=1 turns it off again.
+    """
+    _require_admin()
+    if request.args.get("stop") == "1":
+        profiler.stop_allocations()
+        return jsonify({"tracing": "off"})
+    group = request.args.get("group", "lineno")
+    if group not in ("lineno", "filename", "traceback"):
+        return jsonify({"error": "group must be lineno, filename or traceback"}), 400
+    return jsonify({
+        "games": sessions.memory(),
+        "allocations": profiler.allocations(max(1, min(request.args.get("top", 25, type=int), 500)), group,
+                                            diff=request.args.get("diff") == "1"),
+    })
+
+
+@app.route("/admin/plugins")
+def admin_plugins():
+    _require_admin()
+    return jsonify({"plugins": plugins.available()})
+
+
+@app.route("/admin/plugins/<name>", methods=["PUT"])
+def admin_plugin_upload(name):
+    """Store a strategy plugin; the request body is its Python source."""
+    _require_admin()
+    try:
+        plugins.save(name, request.get_data(as_text=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"status": "ok", "plugin": name})
+
+
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Backtest the bot personalities against recorded price tapes.
+
+A tape is a multi-symbol price series, one row per sub-tick:
+
+  * CSV, wide: a timestamp column then one column per symbol
+        timestamp,BTC,ETH,SOL
+        2021-01-01T00:00:00,29000.5,730.1,1.52
+    Blank cells carry the previous price forward.
+  * Binary (.tape): b"BWTAPE1\\n", a JSON header line {"symbols": [...]} padded
+    to 8 bytes, then little-endian float64 rows of [timestamp, price, ...].
+    It is memory-mapped and read in place. --convert writes one from a CSV.
+
+Rows stream through a generator pipeline into GameEngine.step(prices=...):
+no fetch_prices(), no rendering, no sleeps, and only the last BACKTEST_WINDOW
+sub-ticks of history are kept, so tape length does not bound memory.
+
+    python backtest.py tape.csv
+    python backtest.py tape.csv --convert tape.tape
+    python backtest.py tape.tape --every 5 --seed 7
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import random
+import sys
+import time
+from array import array
+from datetime import datetime
+from itertools import islice
+
+from config import BACKTEST_WINDOW, BACKTEST_VOLATILITY, STARTING_CASH, TICKS_PER_ROUND
+from engine import GameEngine
+from universe import Universe
+
+MAGIC = b"BWTAPE1\n"
+
+
+# ─── TAPE READERS ────────────────────────────────────────────
+def _timestamp(value: str, row_num: int) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return float(row_num)
+
+
+def read_csv(path: str):
+    """(symbols, rows) for a wide CSV tape; rows yields (timestamp, prices tuple)."""
+    f = open(path, newline="")
+    reader = csv.reader(f)
+    header = next(reader)
+    symbols = [s.strip().upper() for s in header[1:]]
+
+    def rows():
+        with f:
+            last = [None] * len(symbols)
+            for n, row in enumerate(reader):
+                for i, cell in enumerate(row[1:len(symbols) + 1]):
+                    if cell.strip():
+                        last[i] = float(cell)
+                if None in last:
+                    continue    # wait until every symbol has printed once
+                yield _timestamp(row[0], n), tuple(last)
+
+    return symbols, rows()
+
+
+def read_binary(path: str):
+    """(symbols, rows) for a memory-mapped .tape file."""
+    f = open(path, "rb")
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a tape file")
+    end = mm.find(b"\n", len(MAGIC))
+    symbols = json.loads(mm[len(MAGIC):end])["symbols"]
+    data = memoryview(mm)[end + 1:].cast("d")
+    width = len(symbols) + 1
+
+    def rows():
+        try:
+            for start in range(0, len(data) - width + 1, width):
+                # No view outlives the loop body, so the map can be closed afterwards
+                yield data[start], tuple(data[start + 1:start + width])
+        finally:
+            data.release()
+            mm.close()
+            f.close()
+
+    return symbols, rows()
+
+
+def open_tape(path: str):
+    with open(path, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    return read_binary(path) if binary else read_csv(path)
+
+
+def write_binary(path: str, symbols: list, rows):
+    """Write (timestamp, prices) rows as a .tape file; returns the row count."""
+    header = json.dumps({"symbols": symbols}).encode()
+    pad = -(len(MAGIC) + len(header) + 1) % 8
+    count = 0
+    with open(path, "wb") as out:
+        out.write(MAGIC + header + b" " * pad + b"\n")
+        while True:
+            chunk = array("d")
+            for ts, prices in islice(rows, 4096):
+                chunk.append(ts)
+                chunk.extend(prices)
+                count += 1
+            if not chunk:
+                break
+            if sys.byteorder != "little":
+                chunk.byteswap()
+            chunk.tofile(out)
+    return count
+
+
+# ─── PIPELINE ────────────────────────────────────────────────
+def every(rows, n: int):
+    """Keep one row in n (e.g. minute bars -> 5-minute sub-ticks)."""
+    return islice(rows, 0, None, n) if n > 1 else rows
+
+
+def replay(engine: GameEngine, symbols: list, rows, window: int = BACKTEST_WINDOW):
+    """Feed rows into the engine; yields the engine at the end of each round."""
+    step = engine.step
+    assets = list(engine.assets.values())
+    keep_candles = max(1, window // TICKS_PER_ROUND)
+    for _, prices in rows:
+        step(prices=dict(zip(symbols, prices)))
+        if engine.sub_tick == 0:
+            # Amortized trim: cut back to the window once a buffer has doubled. The
+            # opening price at history[0] stays: strategy_whale measures from it
+            for asset in assets:
+                if len(asset.history) > 2 * window:
+                    del asset.history[1:-window]
+                    del asset.candles[:-keep_candles]
+            for bot in engine.bots:
+                if len(bot.net_worth_history) > 2 * keep_candles:
+                    del bot.net_worth_history[:-keep_candles]
+            yield engine
+
+
+# ─── DRIVER ──────────────────────────────────────────────────
+def backtest(path: str, sample_every: int = 1, population: int | None = None):
+    """Run every personality over the tape; returns (engine, start prices, seconds)."""
+    symbols, rows = open_tape(path)
+    rows = every(rows, sample_every)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError(f"{path}: no complete rows")
+    _, start_prices = first
+    universe = Universe(
+        assets=[{"symbol": sym, "name": sym, "price": price, "volatility": BACKTEST_VOLATILITY, "trend": 0.0}
+                for sym, price in zip(symbols, start_prices)],
+        events=[],   # real tapes already contain the news
+    )
+    engine = GameEngine(live_prices=False, population=population, universe=universe)
+    engine.pool_actions = True
+    engine.total_rounds = float("inf")
+    engine.win_target = float("inf")
+
+    started = time.perf_counter()
+    for _ in replay(engine, symbols, rows):
+        pass
+    engine.game_over = True
+    engine.win_reason = "tape_complete"
+    return engine, dict(zip(symbols, start_prices)), time.perf_counter() - started
+
+
+def print_report(engine: GameEngine, start_prices: dict, elapsed: float):
+    ticks = engine.ticks
+    print(f"\n  {ticks:,} sub-ticks ({engine.round} rounds) in {elapsed:.2f}s "
+          f"— {ticks / elapsed if elapsed else 0:,.0f} sub-ticks/s\n")
+    assets = engine.assets
+    for sym, asset in islice(assets.items(), 10):
+        print(f"  {sym:<8} {start_prices[sym]:>12,.2f} -> {asset.price:>12,.2f}")
+    print(f"\n  {'BOT':<20} {'NET WORTH':>14} {'RETURN':>9} {'TRADES':>7} {'SHARPE':>7} {'MAX DD':>7}")
+    ranked = sorted(((b.net_worth(), b) for b in engine.bots), key=lambda t: t[0], reverse=True)
+    for nw, bot in ranked[:25]:
+        ret = (nw - STARTING_CASH) / STARTING_CASH * 100
+        print(f"  {bot.name:<20} ${nw:>13,.2f} {ret:>+8.1f}% {bot.trades_made:>7} "
+              f"{bot.risk.sharpe:>7.3f} {bot.risk.max_drawdown * 100:>6.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the bot personalities on a recorded price tape")
+    parser.add_argument("tape", help="CSV or .tape file (see module docstring)")
+    parser.add_argument("--every", type=int, default=1, metavar="N", help="use one row in N (default: 1)")
+    parser.add_argument("--population", type=int, metavar="N", help="spawn N parametrized bots instead of 9")
+    parser.add_argument("--seed", type=int, help="seed the RNG (trader picks, taunts)")
+    parser.add_argument("--convert", metavar="OUT", help="write the tape as a binary .tape file and exit")
+    args = parser.parse_args(argv)
+
+    if args.convert:
+        symbols, rows = open_tape(args.tape)
+        n = write_binary(args.convert, symbols, rows)
+        print(f"wrote {n:,} rows x {len(symbols)} symbols to {args.convert}")
+        return
+    if args.seed is not None:
+        random.seed(args.seed)
+    engine, start_prices, elapsed = backtest(args.tape, args.every, args.population)
+    print_report(engine, start_prices, elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Headless engine benchmark: time and allocation churn per sub-tick.
+
+Plays a seeded offline game without building state, the way sweeps, odds
+rollouts and backtests drive the engine, and reports:
+
+  * mean and p95 wall time per sub-tick
+  * bytes per bot at construction, and still held per bot when the run ends
+  * bytes allocated and released again within a sub-tick (tracemalloc peak
+    over the sub-tick's starting level)
+
+Allocation figures come from a second, traced pass, so they do not skew the
+timings.
+
+    python bench.py
+    python bench.py --population 10000 --ticks 300
+    python bench.py --population 0 --ticks 3000     # the classic nine-bot game
+
+To compare two trees on the same machine, record one run and diff against it:
+
+    python bench.py --save before.json              # on the old tree
+    python bench.py --compare before.json           # on the new one
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from engine import GameEngine
+
+
+def _engine(population: int, seed: int) -> GameEngine:
+    random.seed(seed)
+    engine = GameEngine(live_prices=False, population=population or None)
+    engine.pool_actions = True
+    return engine
+
+
+def timed(population: int, ticks: int, seed: int) -> dict:
+    engine = _engine(population, seed)
+    times = []
+    clock = time.perf_counter
+    for _ in range(ticks):
+        if engine.game_over:
+            break
+        start = clock()
+        engine.step()
+        times.append(clock() - start)
+    times.sort()
+    return {
+        "ticks": len(times),
+        "mean_ms": statistics.fmean(times) * 1000,
+        "p95_ms": times[int(len(times) * 0.95)] * 1000,
+    }
+
+
+def traced(population: int, ticks: int, seed: int) -> dict:
+    tracemalloc.start()
+    engine = _engine(population, seed)
+    built = tracemalloc.get_traced_memory()[0]
+    churn = []
+    for _ in range(ticks):
+        if engine.game_over:
+            break
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        engine.step()
+        churn.append(tracemalloc.get_traced_memory()[1] - start)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {
+        "built_bytes_per_bot": built / len(engine.bots),
+        "retained_bytes_per_bot": retained / len(engine.bots),
+        "churn_bytes_per_tick": statistics.fmean(churn),
+    }
+
+
+def compare(result: dict, baseline: dict):
+    """Print each figure next to the baseline's, with the relative change."""
+    if baseline.get("population") != result["population"]:
+        print(f"  (baseline population is {baseline.get('population')}, not {result['population']})")
+    print(f"\n  {'':24}{'baseline':>12}{'now':>12}{'change':>10}")
+    for key, value in result.items():
+        old = baseline.get(key)
+        if key in ("population", "ticks") or not isinstance(old, (int, float)):
+            continue
+        change = f"{(value - old) / old * 100:+9.1f}%" if old else ""
+        print(f"  {key:24}{old:12.3f}{value:12.3f}{change}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless GameEngine.step()")
+    parser.add_argument("--population", type=int, default=2000, help="bots; 0 for the classic game (default: 2000)")
+    parser.add_argument("--ticks", type=int, default=600, help="sub-ticks to time (default: 600)")
+    parser.add_argument("--traced-ticks", type=int, default=150,
+                        help="sub-ticks in the tracemalloc pass, 0 to skip (default: 150)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save", metavar="FILE", help="also write the results to FILE as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare against results saved with --save")
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    result = {"population": args.population} | timed(args.population, args.ticks, args.seed)
+    if args.traced_ticks:
+        result |= traced(args.population, args.traced_ticks, args.seed)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=1)
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"\n  population {args.population or 'classic'}, {result['ticks']} sub-ticks")
+    print(f"  per sub-tick   {result['mean_ms']:8.3f} ms mean   {result['p95_ms']:8.3f} ms p95")
+    if args.traced_ticks:
+        print(f"  per bot        {result['built_bytes_per_bot']:8.0f} B built   "
+              f"{result['retained_bytes_per_bot']:8.0f} B at the end")
+        print(f"  churn          {result['churn_bytes_per_tick'] / 1024:8.1f} KiB per sub-tick")
+    if baseline is not None:
+        compare(result, baseline)
+
+
+if __name__ == "__main__":
+    main()
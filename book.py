@@ -0,0 +1,54 @@
+"""Fixed-point accounts: cash, positions and cost for every bot in a game.
+
+Money is integer micro-dollars (MONEY_SCALE units per dollar) in flat
+array("q") buffers with one row per bot, so trades move exact integers and
+PnL and cost basis come out the same on every machine. The only float to
+integer step is quote(), once per sub-tick, which fixes the price every bot
+trades and is valued at. numpy views over the same buffers value all bots
+at once without copying them.
+
+    cash[row]                      cash of the bot in that row
+    holdings[row * n_assets + id]  units of asset `id` it holds
+    cost[row * n_assets + id]      what it paid for those units, in total
+    prices[id]                     last quoted price of asset `id`
+"""
+
+from array import array
+
+import numpy as np
+
+from config import MONEY_SCALE
+
+SCALE = MONEY_SCALE
+
+
+def to_units(dollars: float) -> int:
+    return round(dollars * SCALE)
+
+
+def to_dollars(units: int) -> float:
+    return units / SCALE
+
+
+class Book:
+    def __init__(self, n_bots: int, n_assets: int, cash: float):
+        self.n_bots = n_bots
+        self.n_assets = n_assets
+        self.cash = array("q", [to_units(cash)]) * n_bots
+        self.holdings = array("q", bytes(8 * n_bots * n_assets))
+        self.cost = array("q", bytes(8 * n_bots * n_assets))
+        self.prices = array("q", bytes(8 * n_assets))
+
+    def quote(self, assets):
+        """Fix this sub-tick's price of each asset."""
+        prices = self.prices
+        for asset in assets:
+            prices[asset.id] = round(asset.price * SCALE)
+
+    def net_worths(self) -> np.ndarray:
+        """Every bot's net worth in units, by row: cash + holdings @ prices, exact in int64."""
+        holdings = np.frombuffer(self.holdings, dtype=np.int64).reshape(self.n_bots, self.n_assets)
+        return np.frombuffer(self.cash, dtype=np.int64) + holdings @ np.frombuffer(self.prices, dtype=np.int64)
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.cash, self.holdings, self.cost, self.prices))
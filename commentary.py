@@ -0,0 +1,54 @@
+"""Trade commentary catalog, compiled once from config.COMMENTARY.
+
+Strategies record a template id and its arguments (pick() plus a tuple) on
+each TradeAction instead of formatting text; render() builds the string only
+when get_state() or the CLI shows the action. Headless games still pick a
+template and store its arguments, so they draw the RNG exactly as a rendered
+game does, but never format the text. Every group's lines are rewritten to
+positional fields in the group's ARGS order at import, and a line using a
+placeholder its group does not declare fails there rather than mid-game.
+"""
+
+import random
+import string
+
+from config import COMMENTARY
+
+# Argument order per group; groups not listed take (sym,) if their lines use it, else nothing
+ARGS = {
+    "sniper_buy": ("event", "sym"),
+    "taunt": ("target", "bot"),
+}
+
+NONE = -1                   # template id of an action with no commentary
+
+TEMPLATES: list = []        # template id -> positional format string
+GROUPS: dict = {}           # group -> (first template id, line count)
+
+
+def _compile():
+    formatter = string.Formatter()
+    for group, lines in COMMENTARY.items():
+        used = {name for line in lines for _, name, _, _ in formatter.parse(line) if name}
+        names = ARGS.get(group, ("sym",) if used else ())
+        unknown = used - set(names)
+        if unknown:
+            raise ValueError(f"commentary group {group!r} uses undeclared {', '.join(sorted(unknown))}")
+        fields = {name: f"{{{i}}}" for i, name in enumerate(names)}
+        GROUPS[group] = (len(TEMPLATES), len(lines))
+        TEMPLATES.extend(line.format(**fields) for line in lines)
+
+
+_compile()
+
+
+def pick(group: str) -> int:
+    """A template id from `group`, drawn at random when it has several lines."""
+    first, count = GROUPS[group]
+    # Several lines: randrange(n) consumes the RNG as random.choice over them did.
+    # One line: no draw, as when that line was a fixed string.
+    return first + random.randrange(count) if count > 1 else first
+
+
+def render(template: int, args: tuple) -> str:
+    return TEMPLATES[template].format(*args) if template != NONE else ""
@@ -1,7 +1,10 @@
 """Game configuration: constants, asset templates, event pool, bot profiles."""
 
+import os
+
 TOTAL_ROUNDS = 100
 STARTING_CASH = 1_000.0
+MONEY_SCALE = 1_000_000       # accounting units per dollar (micro-dollars, see book.py)
 WIN_TARGET = 10_000.0
 TICKS_PER_ROUND = 30          # sub-ticks per round (~4s each = ~120s per round)
 
@@ -14,7 +17,11 @@ ASSETS_TEMPLATE = [
     {"symbol": "XRP",  "name": "XRP",        "price": 2.50,     "volatility": 0.65, "trend": 0.0},
 ]
 
+# Optional JSON/CSV universe file that replaces ASSETS_TEMPLATE (see universe.py)
+ASSETS_FILE = os.environ.get("ASSETS_FILE", "")
+
 # ─── MARKET EVENTS ───────────────────────────────────────────
+# duration is in rounds; an optional "followup" is scheduled "delay" sub-ticks after the event ends
 EVENT_POOL = [
     {"name": "REGULATORY CRACKDOWN", "description": "SEC announces new crypto regulations.", "target_asset": "ALL", "price_impact": -0.04, "duration": 2},
     {"name": "BTC ETF INFLOWS", "description": "Record inflows into Bitcoin spot ETFs!", "target_asset": "BTC", "price_impact": 0.08, "duration": 2},
@@ -23,17 +30,23 @@ EVENT_POOL = [
     {"name": "BNB BURN EVENT", "description": "Binance burns massive BNB supply!", "target_asset": "BNB", "price_impact": 0.06, "duration": 2},
     {"name": "XRP LAWSUIT WIN", "description": "Ripple scores major legal victory!", "target_asset": "XRP", "price_impact": 0.12, "duration": 1},
     {"name": "BULL STAMPEDE", "description": "Investors go full FOMO!", "target_asset": "ALL", "price_impact": 0.05, "duration": 1},
-    {"name": "FLASH CRASH", "description": "Liquidation cascade triggers massive selloff!", "target_asset": "ALL", "price_impact": -0.08, "duration": 1},
+    {"name": "FLASH CRASH", "description": "Liquidation cascade triggers massive selloff!", "target_asset": "ALL", "price_impact": -0.08, "duration": 1,
+     "followup": {"name": "DEAD CAT BOUNCE", "description": "Dip buyers pile in after the crash!", "target_asset": "ALL", "price_impact": 0.04, "duration": 0, "delay": 0}},
     {"name": "WHALE ALERT", "description": "Whale moves 10,000 BTC to exchange!", "target_asset": "BTC", "price_impact": -0.06, "duration": 1},
     {"name": "ETH GAS SPIKE", "description": "Ethereum gas fees hit all-time highs!", "target_asset": "ETH", "price_impact": -0.05, "duration": 1},
-    {"name": "SOL OUTAGE", "description": "Solana network experiences downtime!", "target_asset": "SOL", "price_impact": -0.10, "duration": 1},
+    {"name": "SOL OUTAGE", "description": "Solana network experiences downtime!", "target_asset": "SOL", "price_impact": -0.10, "duration": 1,
+     "followup": {"name": "SOL BACK ONLINE", "description": "Validators restart, Solana is back!", "target_asset": "SOL", "price_impact": 0.05, "duration": 1, "delay": 3}},
     {"name": "FED RATE HIKE", "description": "Interest rates go up. Risk-off mode.", "target_asset": "ALL", "price_impact": -0.03, "duration": 3},
     {"name": "STIMULUS CHECK", "description": "Money printer goes brrrr!", "target_asset": "ALL", "price_impact": 0.04, "duration": 2},
     {"name": "SHORT SQUEEZE", "description": "Massive short liquidations across the market!", "target_asset": "ALL", "price_impact": 0.06, "duration": 1},
-    {"name": "HACK SCARE", "description": "Major exchange reports security breach!", "target_asset": "ALL", "price_impact": -0.07, "duration": 1},
+    {"name": "HACK SCARE", "description": "Major exchange reports security breach!", "target_asset": "ALL", "price_impact": -0.07, "duration": 1,
+     "followup": {"name": "FUNDS RECOVERED", "description": "Exchange confirms user funds are safe.", "target_asset": "ALL", "price_impact": 0.03, "duration": 1, "delay": 10}},
 ]
 
 # ─── BOT PROFILES ────────────────────────────────────────────
+# Everything except name/icon/color/motto is a strategy parameter (see
+# strategies.py). risk_tolerance caps one asset's share of net worth, trade_size
+# is the share of cash per buy, percentages are price moves per sub-tick.
 BOT_PROFILES = {
     "aggressive": {
         "name": "HYPERCLAW AI",
@@ -42,6 +55,10 @@ BOT_PROFILES = {
         "motto": "Strike hard. Strike fast. No mercy.",
         "risk_tolerance": 0.8,
         "trade_size": 0.4,
+        "min_volatility": 0.5,
+        "entry_chance": 0.6,
+        "take_profit": 2.0,
+        "stop_loss": 5.0,
     },
     "cautious": {
         "name": "CLAWCORE",
@@ -50,6 +67,10 @@ BOT_PROFILES = {
         "motto": "Slow and steady wins the war.",
         "risk_tolerance": 0.2,
         "trade_size": 0.1,
+        "max_volatility": 0.5,
+        "entry_chance": 0.5,
+        "take_profit": 3.0,
+        "bnb_chance": 0.4,          # chance of the standing BNB buy
     },
     "momentum": {
         "name": "CLAW LABS",
@@ -58,6 +79,7 @@ BOT_PROFILES = {
         "motto": "Ride the wave or drown trying.",
         "risk_tolerance": 0.6,
         "trade_size": 0.3,
+        "lookback": 3,
     },
     "contrarian": {
         "name": "APEX",
@@ -66,6 +88,8 @@ BOT_PROFILES = {
         "motto": "When they zig, I zag.",
         "risk_tolerance": 0.5,
         "trade_size": 0.25,
+        "entry_move": 3.0,
+        "take_profit": 4.0,
     },
     "degen": {
         "name": "NEUROCLAW",
@@ -74,6 +98,8 @@ BOT_PROFILES = {
         "motto": "ALL IN OR NOTHING. THIS IS THE WAY.",
         "risk_tolerance": 1.0,
         "trade_size": 0.7,
+        "entry_chance": 0.7,
+        "exit_chance": 0.3,
     },
     "sniper": {
         "name": "NEURAL CLAW",
@@ -90,6 +116,8 @@ BOT_PROFILES = {
         "motto": "I AM the market.",
         "risk_tolerance": 0.55,
         "trade_size": 0.35,
+        "entry_chance": 0.5,
+        "take_profit": 3.0,
     },
     "scalper": {
         "name": "METACLAW",
@@ -98,6 +126,9 @@ BOT_PROFILES = {
         "motto": "A penny here, a penny there — real money.",
         "risk_tolerance": 0.3,
         "trade_size": 0.15,
+        "entry_move": 0.5,
+        "entry_chance": 0.7,
+        "take_profit": 0.5,
     },
     "diamond_hands": {
         "name": "CLAWOPS",
@@ -106,5 +137,191 @@ BOT_PROFILES = {
         "motto": "These hands don't fold.",
         "risk_tolerance": 0.5,
         "trade_size": 0.2,
+        "entry_chance": 0.4,
+        "stop_loss": 10.0,
     },
+    # Bots driven by a user plugin (plugins.py); no strategy parameters
+    "plugin": {
+        "name": "PLUGIN",
+        "icon": "\U0001f9e9",
+        "color": "#94a3b8",
+        "motto": "Third-party code, first-party losses.",
+    },
+}
+
+# ─── COMMENTARY ──────────────────────────────────────────────
+# Trade commentary and taunts. A group with several lines picks one at random.
+# Placeholders: {sym} the traded asset, {event} an event name, {target} the
+# taunted bot, {bot} the taunting bot (see commentary.ARGS).
+COMMENTARY = {
+    "aggressive_buy": [
+        "Going HARD on {sym}! Blood in the water!",
+        "Smells like money. Loading {sym}.",
+        "Weakness is opportunity. Buying {sym} NOW.",
+    ],
+    "aggressive_take_profit": ["Taking profits on {sym}. The weak hold, the strong sell."],
+    "aggressive_stop_loss": ["Cutting losses on {sym}. No sentiment. Only survival."],
+    "cautious_buy": [
+        "Carefully adding {sym} to portfolio.",
+        "Diversifying into {sym}. Patience pays.",
+        "Small position in {sym}. Risk managed.",
+    ],
+    "cautious_trim": ["Trimming {sym}. Locking in gains responsibly."],
+    "cautious_bnb": ["BNB is the safe play. Always."],
+    "momentum_buy": [
+        "{sym} is LAUNCHING! Hopping on the rocket!",
+        "Momentum confirmed on {sym}. LFG!",
+        "{sym} to the MOON! Trend is my friend!",
+    ],
+    "momentum_exit": ["Trend broken on {sym}. Ejecting!"],
+    "contrarian_buy": [
+        "Everyone's selling {sym}? I'm BUYING.",
+        "Blood in the streets on {sym}. Time to feast.",
+        "The herd is wrong about {sym}. Classic.",
+    ],
+    "contrarian_sell": ["Too much euphoria on {sym}. Selling into strength."],
+    "degen_buy": [
+        "YOLO!!! SOL TO THE MOON!!!",
+        "APE IN APE IN APE IN!!!",
+        "Sir, this is a casino. ALL IN on SOL!",
+        "DIAMOND HANDS BABY! BUYING MORE SOL!",
+        "Solana ecosystem is cooking. I'm in.",
+    ],
+    "degen_sell": [
+        "Paper handing {sym} for more SOL money!",
+        "Selling {sym} because I got bored.",
+        "Need cash for the next YOLO. Dumping {sym}.",
+    ],
+    "sniper_buy": ["Event detected: {event}. Sniping {sym}."],
+    "sniper_exit": ["Negative event on {sym}. Precision exit."],
+    "sniper_hold": [
+        "Waiting... Patience is a weapon.",
+        "No signal. No trade. Discipline.",
+        "*scans the market through the scope*",
+    ],
+    "whale_buy": [
+        "Accumulating {sym}. They don't see me coming.",
+        "Adding to my {sym} position. I own this market.",
+        "*splashes into {sym}* The ocean is mine.",
+    ],
+    "whale_sell": ["Redistributing {sym}. The market bends to my will."],
+    "scalper_buy": [
+        "Scalping {sym}. In and out, quick profit.",
+        "Tiny dip on {sym}. Free money.",
+        "Tick by tick. Buying {sym}.",
+    ],
+    "scalper_sell": [
+        "Booking the tick on {sym}. Every cent counts.",
+        "Quick flip on {sym}. Next.",
+        "Scalped {sym}. Rinse and repeat.",
+    ],
+    "diamond_buy": [
+        "Adding {sym} to the vault. Never selling.",
+        "Accumulating {sym}. Diamond hands don't waver.",
+        "HODL {sym}. Time in market > timing the market.",
+    ],
+    "diamond_trim": ["Even diamond hands crack sometimes... trimming {sym}."],
+    "diamond_hold": [
+        "HODL. It's not just a strategy, it's a lifestyle.",
+        "Still holding. Still winning.",
+        "Paper hands get paper gains. I want diamonds.",
+    ],
+    "taunt": [
+        "Hey {target}, is that a portfolio or a dumpster fire?",
+        "{target} trades like a goldfish with a credit card.",
+        "My strategy is so advanced, {target}'s account just filed for bankruptcy.",
+        "While {target} was sleeping, I was TRADING.",
+        "Imagine losing money in THIS market. Couldn't be me. *looks at {target}*",
+        "{target}, your strategy is basically 'buy high sell low' right?",
+        "*{bot} flexes on {target}*",
+        "GG EZ, {target}. GG EZ.",
+        "I've seen better trades from a random number generator. Looking at you, {target}.",
+        "Just checked the leaderboard. {target} is speed-running poverty.",
+    ],
 }
+
+# ─── POPULATION MODE ─────────────────────────────────────────
+POPULATION_MAX = 10_000           # cap for GameEngine(population=N)
+POPULATION_ACTIVE_FRACTION = 0.03 # share of bots that trade each sub-tick
+POPULATION_PARAM_JITTER = 0.5     # trade_size drawn from profile * U(1 - j, 1 + j)
+POPULATION_TOP_K = 25             # bots serialized in get_state()
+
+# ─── BACKTESTING ─────────────────────────────────────────────
+BACKTEST_WINDOW = 5_000           # sub-ticks of price history kept per asset while replaying a tape
+BACKTEST_VOLATILITY = 0.5         # assumed for tape symbols (strategies branch on it)
+
+# ─── PARAMETER SWEEPS ────────────────────────────────────────
+SWEEP_CACHE_DIR = os.environ.get("SWEEP_CACHE_DIR", ".sweep_cache")
+SWEEP_SEEDS = 30                  # seeded games per candidate
+
+# ─── FORECASTS ───────────────────────────────────────────────
+FORECAST_PATHS = 10_000           # Monte-Carlo paths per asset
+FORECAST_MAX_PATHS = 50_000
+FORECAST_STEPS = 100              # sub-ticks ahead
+FORECAST_MAX_STEPS = 1_000
+FORECAST_POINTS = 50              # time points returned per band
+FORECAST_PERCENTILES = (5, 25, 50, 75, 95)
+
+# ─── WIN ODDS ────────────────────────────────────────────────
+# Off by default: every round costs ODDS_ROLLOUTS full playouts of CPU
+ODDS_ENABLED = os.environ.get("ODDS_ENABLED", "0") == "1"
+ODDS_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+ODDS_BATCH = 8                    # playouts per pool task; odds refresh as each batch lands
+ODDS_ROLLOUTS = min(64, ODDS_BATCH * 2 * ODDS_WORKERS)   # playouts per round, two batches per worker
+
+# ─── PLUGINS ─────────────────────────────────────────────────
+# User strategies (PLUGIN_DIR/<name>.py, see plugins.py) run in worker processes
+PLUGIN_DIR = os.environ.get("PLUGIN_DIR", "plugins")
+PLUGIN_WORKERS = int(os.environ.get("PLUGIN_WORKERS", "2"))
+PLUGIN_DEADLINE = 0.1             # seconds a sub-tick waits for its plugin decisions; late ones forfeit
+PLUGIN_CPU_SECONDS = 1            # CPU per decision before the worker is killed (whole seconds)
+PLUGIN_MEMORY_MB = 256            # address space a worker may grow by past its start-up size
+PLUGIN_HISTORY = 50               # recent prices per asset in a snapshot
+PLUGIN_MAX_ORDERS = 10            # orders per decision; more forfeits the turn
+PLUGIN_MAX_BYTES = 64 * 1024      # plugin source, and one decision's reply
+
+# ─── RESULTS STORE ───────────────────────────────────────────
+STORE_PATH = os.environ.get("STORE_PATH", "results.db")   # SQLite file; empty disables the store
+STORE_ROUNDS = os.environ.get("STORE_ROUNDS", "0") == "1"  # per-round net-worth snapshots
+STORE_LEDGER = os.environ.get("STORE_LEDGER", "0") == "1"  # every executed trade
+STORE_BATCH = 1_000               # rows per executemany flush
+STORE_FLUSH_SECONDS = 1.0         # max time a row waits in the writer queue
+STORE_QUEUE_MAX = 10_000          # queued row batches; past this new rows are dropped, not buffered
+
+# ─── SERVER / OBSERVABILITY ──────────────────────────────────
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"
+PROFILER_ENABLED = os.environ.get("PROFILER_ENABLED", "0") == "1"
+PROFILER_HZ = float(os.environ.get("PROFILER_HZ", "100"))
+SLOW_TICK_MS = float(os.environ.get("SLOW_TICK_MS", "250"))
+SLOW_TICK_KEEP = 20           # most recent slow ticks kept in memory
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")   # /admin/* is disabled when empty
+# A game advances at most once per window, however many clients poll /api/tick (the UI polls every 4s)
+TICK_WINDOW_SECONDS = float(os.environ.get("TICK_WINDOW_SECONDS", "3.0"))
+ADVANCE_MAX_TICKS = TICKS_PER_ROUND * 10   # most sub-ticks one /api/advance call may run
+STATE_MAX_AGE = 1             # seconds shared caches may serve /api/state before revalidating
+STATE_GZIP_LEVEL = 6
+
+# Admission control for engine-running endpoints (tick, advance, new_game)
+# Proxies in front of the app whose X-Forwarded-For is trusted for the client
+# address; Vercel's edge is one. Left at 0, clients behind it would share a bucket
+PROXY_HOPS = int(os.environ.get("PROXY_HOPS", "1" if os.environ.get("VERCEL") else "0"))
+ADMISSION_ENABLED = os.environ.get("ADMISSION_ENABLED", "1") == "1"
+CLIENT_RATE = 2.0             # requests/second refilled per client address
+CLIENT_BURST = 10
+GAME_RATE = 10.0              # per game, across all its viewers (only ticks that advance count)
+GAME_BURST = 30
+ENGINE_SLOTS = 4              # engine operations running at once
+ENGINE_QUEUE = 16             # more may wait this long for a slot, then 503
+ENGINE_QUEUE_TIMEOUT = 2.0
+
+# Memory budget: over ENGINE_MEMORY_MB a game compacts its old history (LTTB,
+# recent tails kept exact); over MEMORY_BUDGET_MB in total, idle games go first
+ENGINE_MEMORY_BUDGET = int(os.environ.get("ENGINE_MEMORY_MB", "64")) * 2**20
+MEMORY_BUDGET = int(os.environ.get("MEMORY_BUDGET_MB", "512")) * 2**20
+COMPACT_KEEP_TICKS = TICKS_PER_ROUND * 10   # recent price history left exact
+COMPACT_POINTS = 500                        # what the older prices shrink to
+COMPACT_KEEP_ROUNDS = 20                    # recent net-worth history left exact
+COMPACT_ROUND_POINTS = 50
+SESSION_IDLE_SECONDS = 600    # games nobody has read for this long are evicted
+MEMORY_CHECK_SECONDS = 30     # how often the registry re-checks idle games and the total budget
+TRACEMALLOC_FRAMES = 10       # traceback depth once /admin/memory starts tracing
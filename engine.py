@@ -1,113 +1,317 @@
 """Game engine — simulation logic with JSON-serializable state output."""
 
+import heapq
 import random
-from config import TOTAL_ROUNDS, STARTING_CASH, ASSETS_TEMPLATE, EVENT_POOL, BOT_PROFILES, WIN_TARGET, TICKS_PER_ROUND
-from models import Asset, MarketEvent, TradeAction, BotPersonality, Bot
+import sys
+import uuid
+from array import array
+from operator import itemgetter
+from config import TOTAL_ROUNDS, STARTING_CASH, WIN_TARGET, TICKS_PER_ROUND
+from config import POPULATION_MAX, POPULATION_ACTIVE_FRACTION, POPULATION_PARAM_JITTER, POPULATION_TOP_K
+from config import COMPACT_KEEP_TICKS, COMPACT_POINTS, COMPACT_KEEP_ROUNDS, COMPACT_ROUND_POINTS
+from analytics import exposure
+from book import SCALE, Book
+from models import (Asset, MarketEvent, TradeAction, BotPersonality, BUILTIN_PERSONALITIES, Bot, profile_params,
+                    recycle_actions)
 from prices import fetch_prices
+from scheduler import EventScheduler
+from series import lttb, merge_candles, compact, original_length, original_positions
+from universe import Universe, default_universe
+import metrics
+import plugins
 import strategies
 
+# Per-object sizes for memory_bytes(), measured with tracemalloc
+BOT_BYTES = 900          # a Bot with its profile strings, params and RiskStats
+CANDLE_BYTES = 192       # one [open, high, low, close] list
+ACTION_BYTES = 210       # one TradeAction with its commentary args
+
 
 class GameEngine:
-    def __init__(self):
-        live_prices = fetch_prices()
+    def __init__(self, live_prices: bool = True, population: int | None = None, universe: Universe | None = None,
+                 params: dict | None = None, plugin_names: list | None = None):
+        # live_prices=False keeps the game offline: template start prices, no CoinGecko sync
+        self.live_prices = live_prices
+        universe = universe or default_universe()
+        self.event_pool = universe.events
+        # population=N spawns N bots spread across the personalities instead of one each
+        self.population = min(population, POPULATION_MAX) if population else None
+        # params={"aggressive": {"stop_loss": 8.0}, ...} overrides profile strategy parameters
+        self.params = params or {}
+        # plugin_names=["meanrev", ...] seats one more bot per named plugins.py strategy
+        self.plugin_names = tuple(dict.fromkeys(plugin_names or ()))
+        start_prices = fetch_prices() if live_prices else {}
         self.assets = {}
-        for tmpl in ASSETS_TEMPLATE:
+        for tmpl in universe.assets:
             sym = tmpl["symbol"]
             self.assets[sym] = Asset(
                 symbol=sym,
                 name=tmpl["name"],
-                price=live_prices.get(sym, tmpl["price"]),
+                price=start_prices.get(sym, tmpl["price"]),
                 volatility=tmpl["volatility"],
                 trend=tmpl["trend"],
-                history=[],
+                id=len(self.assets),
             )
-        self.bots = [Bot(p, STARTING_CASH) for p in BotPersonality]
+        n_bots = (self.population or len(BUILTIN_PERSONALITIES)) + len(self.plugin_names)
+        self.book = Book(n_bots, len(self.assets), STARTING_CASH)
+        self.book.quote(self.assets.values())
+        if self.population:
+            self.bots = self._spawn_population(self.population)
+        else:
+            self.bots = [Bot(p, self.book, row, params=self.params.get(p.value))
+                         for row, p in enumerate(BUILTIN_PERSONALITIES)]
+        for name in self.plugin_names:
+            self.bots.append(Bot(BotPersonality.PLUGIN, self.book, len(self.bots), label=name, plugin=name))
+        self.bots_by_name = {b.name: b for b in self.bots}
+        self.game_id = uuid.uuid4().hex[:12]
+        # Backtests override these to run a whole tape
+        self.total_rounds = TOTAL_ROUNDS
+        self.win_target = WIN_TARGET
         self.round = 0
         self.sub_tick = 0
         self.game_over = False
         self.win_reason = None
-        self.active_events: list[MarketEvent] = []
-        self.event_timers: dict[str, int] = {}
+        self.ticks = 0                      # absolute sub-tick clock used by the scheduler
+        self.scheduler = EventScheduler()
+        # Updated as events start/end, so per-tick cost is O(assets + events)
+        self.events_by_target: dict[str, list[MarketEvent]] = {}
+        self.event_impact_all = 0.0
+        self.event_impact: dict[str, float] = {}
         self.market_mood = 0.0
         self.round_actions: list[TradeAction] = []
         self.new_event = None
+        self.win_odds = None                # published by odds.WinOdds
+        self.compactions = 0
+        # Headless drivers that never keep an action past the next sub-tick set this to recycle them
+        self.pool_actions = False
+        # Odds rollouts clear this; plugin bots then sit the game out
+        self.run_plugins = True
+        metrics.track_game(self)
+
+    def tick(self, assets=None, width=None):
+        """Advance one sub-tick and return the JSON-serializable state (see get_state)."""
+        if self.game_over:
+            return self.get_state(assets, width)
+
+        clock = metrics.tick_clock()
+        self.step(clock)
+        state = self.get_state(assets, width)
+        clock.lap("serialize")
+        clock.finish(self)
+        return state
+
+    def advance(self, ticks: int, on_step=None) -> dict:
+        """Run up to `ticks` sub-ticks back to back and return a compact summary.
+
+        Live prices are synced once, on the first sub-tick; no state is built in
+        between. `on_step(engine)` runs after each sub-tick (the results store
+        uses it to keep the ledger complete).
+        """
+        start_tick, start_round = self.ticks, self.round
+        buys = sells = 0
+        events = []
+        sync = True
+        while ticks > 0 and not self.game_over:
+            self.step(sync=sync)
+            sync = False
+            ticks -= 1
+            for a in self.round_actions:
+                if a.action == "BUY":
+                    buys += 1
+                elif a.action == "SELL":
+                    sells += 1
+            if self.new_event:
+                events.append(self.new_event.name)
+            if on_step:
+                on_step(self)
+        return {
+            "from_tick": start_tick,
+            "to_tick": self.ticks,
+            "ticks": self.ticks - start_tick,
+            "rounds": self.round - start_round,
+            "buys": buys,
+            "sells": sells,
+            "events": events,
+        }
 
-    def tick(self):
+    def step(self, clock=metrics.NULL_CLOCK, prices: dict | None = None, sync: bool = True):
+        """Advance one sub-tick without building the state (headless drivers).
+
+        `prices` (symbol -> price) replaces the simulated walk for this sub-tick;
+        backtests feed recorded tapes through it. `sync=False` skips the live
+        price fetch and lets the walk run from the current prices.
+        """
         if self.game_over:
-            return self.get_state()
+            return
 
         # On first sub-tick of a new round, advance the round counter
-        if self.sub_tick == 0:
+        new_round = self.sub_tick == 0
+        if new_round:
             self.round += 1
-            if self.round > TOTAL_ROUNDS:
+            if self.round > self.total_rounds:
                 self.game_over = True
                 self.win_reason = self.win_reason or "rounds_complete"
-                return self.get_state()
-            self.new_event = self._generate_events()
+                return
             self._update_market_mood()
-        else:
-            self.new_event = None
+        self.new_event = self._generate_events(self.ticks, spawn=new_round)
+        clock.lap("events")
 
-        # Sync real prices from CoinGecko then apply simulation noise
-        live = fetch_prices()
-        for sym, asset in self.assets.items():
-            if sym in live:
-                asset.price = live[sym]
-            asset.tick(self.market_mood, self.active_events, TICKS_PER_ROUND)
+        if prices is not None:
+            assets = self.assets
+            for sym, price in prices.items():
+                assets[sym].quote(price)
+            self.book.quote(assets.values())
+            clock.lap("asset_tick")
+        else:
+            # Sync real prices from CoinGecko then apply simulation noise
+            live = fetch_prices() if self.live_prices and sync else {}
+            clock.lap("price_sync")
+            impact_all = self.event_impact_all
+            impact = self.event_impact
+            for sym, asset in self.assets.items():
+                if sym in live:
+                    asset.price = live[sym]
+                asset.tick(self.market_mood, impact_all + impact.get(sym, 0.0), TICKS_PER_ROUND)
+            self.book.quote(self.assets.values())
+            clock.lap("asset_tick")
 
-        # Always: pick 2-3 random traders to act this sub-tick
+        if self.pool_actions:
+            recycle_actions(self.round_actions)
         self.round_actions = []
-        num_traders = random.randint(2, 4)
-        trading_bots = random.sample(self.bots, min(num_traders, len(self.bots)))
-        for bot in trading_bots:
-            actions = strategies.decide(bot, self.assets, self.round, self.bots, self.active_events)
+        traders = self._pick_traders()
+        pending = None
+        if self.plugin_names:
+            # Plugin bots decide in the worker pool while the built-in strategies run here
+            plugged = [bot for bot in traders if bot.plugin]
+            if plugged:
+                traders = [bot for bot in traders if not bot.plugin]
+                if self.run_plugins:
+                    pending = plugins.begin(self, plugged)
+        for bot in traders:
+            actions = strategies.decide(bot, self.assets, self.round, self.bots, self.events_by_target)
             self.round_actions.extend(actions)
+            clock.lap_strategy(bot.personality.value)
+        if pending is not None:
+            self.round_actions.extend(plugins.finish(self, pending))
+            clock.lap("plugins")
 
         self.sub_tick += 1
+        self.ticks += 1
 
         # End of round: record history, check win conditions
         if self.sub_tick >= TICKS_PER_ROUND:
             self.sub_tick = 0
 
-            for bot in self.bots:
-                bot.net_worth_history.append(bot.net_worth(self.assets))
-
-            for bot in sorted(self.bots, key=lambda b: b.net_worth(self.assets), reverse=True):
-                if bot.net_worth(self.assets) >= WIN_TARGET:
+            assets = self.assets
+            for asset in assets.values():
+                asset.close_candle()
+            # One vectorized valuation of every bot, rows in self.bots order; the
+            # memoryview yields floats one by one instead of a list of them all
+            for bot, nw in zip(self.bots, memoryview(self.book.net_worths() / SCALE)):
+                bot.net_worth_history.append(nw)
+                bot.risk.record(nw)
+                if nw >= self.win_target:
                     self.game_over = True
                     self.win_reason = "target_reached"
-                    break
 
-            if self.round >= TOTAL_ROUNDS:
+            if self.round >= self.total_rounds:
                 self.game_over = True
                 if not self.win_reason:
                     self.win_reason = "rounds_complete"
+        clock.lap("bookkeeping")
+
+    def _spawn_population(self, n: int) -> list:
+        """n bots, round-robin across personalities, each with jittered trade_size / risk_tolerance."""
+        personalities = BUILTIN_PERSONALITIES
+        bots = []
+        for i in range(n):
+            p = personalities[i % len(personalities)]
+            base = profile_params(p.value) | self.params.get(p.value, {})
+            jitter = random.uniform(1 - POPULATION_PARAM_JITTER, 1 + POPULATION_PARAM_JITTER)
+            params = {
+                "trade_size": min(0.95, base["trade_size"] * jitter),
+                "risk_tolerance": max(0.0, min(1.0, base["risk_tolerance"] * jitter)),
+            }
+            bots.append(Bot(p, self.book, i, label=f"#{i // len(personalities) + 1:04d}", params=params))
+        return bots
+
+    def _pick_traders(self) -> list:
+        """Bots that act this sub-tick: 2-4 in a classic game, a fixed share of a population."""
+        n = len(self.bots)
+        if not self.population:
+            return random.sample(self.bots, min(random.randint(2, 4), n))
+        # Draw indices directly; never materializes a copy of the roster
+        k = min(n, max(2, int(n * POPULATION_ACTIVE_FRACTION)))
+        picked = set()
+        randrange = random.randrange
+        while len(picked) < k:
+            picked.add(randrange(n))
+        bots = self.bots
+        return [bots[i] for i in picked]
+
+    @property
+    def active_events(self) -> list:
+        return [entry.event for entry in self.scheduler.active.values()]
+
+    def schedule_event(self, tmpl: dict, delay: int = 0):
+        """Queue an event-pool template to start `delay` sub-ticks from now (0 = next sub-tick)."""
+        start = self.ticks + delay
+        event = MarketEvent(
+            name=tmpl["name"],
+            description=tmpl["description"],
+            target_asset=tmpl["target_asset"],
+            price_impact=tmpl["price_impact"],
+            duration=tmpl["duration"],
+        )
+        # Lasts the round it starts in plus `duration` more, as the old per-round timers did
+        end = start + (tmpl["duration"] + 1) * TICKS_PER_ROUND
+        return self.scheduler.schedule(event, start, end, then=tmpl.get("followup"))
 
-        return self.get_state()
-
-    def _generate_events(self):
-        expired = [name for name, timer in self.event_timers.items() if timer <= 0]
-        for name in expired:
-            del self.event_timers[name]
-            self.active_events = [e for e in self.active_events if e.name != name]
-
-        for name in self.event_timers:
-            self.event_timers[name] -= 1
-
-        if random.random() < 0.3:
-            tmpl = random.choice(EVENT_POOL)
-            if tmpl["name"] not in self.event_timers:
-                event = MarketEvent(
-                    name=tmpl["name"],
-                    description=tmpl["description"],
-                    target_asset=tmpl["target_asset"],
-                    price_impact=tmpl["price_impact"],
-                    duration=tmpl["duration"],
-                )
-                self.active_events.append(event)
-                self.event_timers[event.name] = event.duration
-                return event
-        return None
+    def event_remaining(self, name: str) -> int:
+        """Whole rounds an active event has left after the current one."""
+        ticks_left = self.scheduler.remaining(name, max(0, self.ticks - 1))
+        return max(0, -(-ticks_left // TICKS_PER_ROUND) - 1)
+
+    def _generate_events(self, now: int, spawn: bool):
+        """Maybe roll a random event, then apply due starts/ends and their follow-ups."""
+        if spawn and self.event_pool and random.random() < 0.3:
+            tmpl = random.choice(self.event_pool)
+            if not self.scheduler.is_live(tmpl["name"], now):
+                self.schedule_event(tmpl)
+
+        new_event = None
+        while True:
+            started, ended = self.scheduler.advance(now)
+            if not started and not ended:
+                return new_event
+            for entry in ended:
+                self._unindex_event(entry.event)
+                if entry.then:
+                    self.schedule_event(entry.then, delay=entry.then.get("delay", 0))
+            for entry in started:
+                self._index_event(entry.event)
+                new_event = entry.event
+
+    def _index_event(self, ev):
+        self.events_by_target.setdefault(ev.target_asset, []).append(ev)
+        self._resum_target(ev.target_asset)
+
+    def _unindex_event(self, ev):
+        evs = self.events_by_target.get(ev.target_asset)
+        if evs and ev in evs:
+            evs.remove(ev)
+            if not evs:
+                del self.events_by_target[ev.target_asset]
+        self._resum_target(ev.target_asset)
+
+    def _resum_target(self, target: str):
+        total = sum(ev.price_impact for ev in self.events_by_target.get(target, ()))
+        if target == "ALL":
+            self.event_impact_all = total
+        elif total:
+            self.event_impact[target] = total
+        else:
+            self.event_impact.pop(target, None)
 
     def _update_market_mood(self):
         self.market_mood += random.gauss(0, 0.15)
@@ -125,21 +329,44 @@ class GameEngine:
             return "BEARISH"
         return "NEUTRAL"
 
-    def get_state(self):
+    def get_state(self, assets=None, width=None):
+        """JSON-serializable game state.
+
+        `assets` limits the asset section to those symbols; `width` LTTB-downsamples
+        each price history to at most that many points and adds their x positions
+        as "history_x" (always present once the history has been compacted).
+        """
         assets_data = {}
-        for sym, asset in self.assets.items():
-            assets_data[sym] = {
+        selected = self.assets.items() if assets is None else (
+            (sym, self.assets[sym]) for sym in assets if sym in self.assets)
+        for sym, asset in selected:
+            entry = assets_data[sym] = {
                 "symbol": asset.symbol,
                 "name": asset.name,
                 "price": round(asset.price, 2),
                 "change_pct": round(asset.change_pct, 2),
                 "volatility": asset.volatility,
-                "history": [round(p, 2) for p in asset.history] + [round(asset.price, 2)],
             }
+            history = asset.history + array("d", (asset.price,))
+            # Compacted: x positions are no longer the list positions
+            positions = original_positions(asset.history_index, len(history))
+            xs = positions
+            if width and len(history) > width:
+                xs, history = lttb(history, width, positions)
+                if positions:
+                    xs = [positions[i] for i in xs]
+            if xs is not None:
+                entry["history_x"] = xs
+            entry["history"] = [round(p, 2) for p in history]
+
+        worths = list(zip(memoryview(self.book.net_worths() / SCALE), self.bots))
+        if self.population:
+            ranked = heapq.nlargest(POPULATION_TOP_K, worths, key=itemgetter(0))
+        else:
+            ranked = sorted(worths, key=itemgetter(0), reverse=True)
 
         bots_data = []
-        for bot in sorted(self.bots, key=lambda b: b.net_worth(self.assets), reverse=True):
-            nw = bot.net_worth(self.assets)
+        for nw, bot in ranked:
             bots_data.append({
                 "name": bot.name,
                 "icon": bot.icon,
@@ -149,12 +376,14 @@ class GameEngine:
                 "cash": round(bot.cash, 2),
                 "net_worth": round(nw, 2),
                 "pnl": round(nw - STARTING_CASH, 2),
-                "holdings": dict(bot.holdings),
+                "holdings": bot.positions(),
                 "trades_made": bot.trades_made,
                 "taunts_given": bot.taunts_given,
                 "best_trade_pnl": round(bot.best_trade_pnl, 2),
                 "worst_trade_pnl": round(bot.worst_trade_pnl, 2),
                 "net_worth_history": [round(v, 2) for v in bot.net_worth_history],
+                "risk": bot.risk.summary(STARTING_CASH),
+                "exposure": exposure(bot, nw),
             })
 
         events_data = []
@@ -164,7 +393,7 @@ class GameEngine:
                 "description": ev.description,
                 "target_asset": ev.target_asset,
                 "price_impact": ev.price_impact,
-                "remaining": self.event_timers.get(ev.name, 0),
+                "remaining": self.event_remaining(ev.name),
             })
 
         new_event_data = None
@@ -178,7 +407,7 @@ class GameEngine:
 
         actions_data = []
         for a in self.round_actions:
-            bot = next((b for b in self.bots if b.name == a.bot_name), None)
+            bot = self.bots_by_name.get(a.bot_name)
             actions_data.append({
                 "bot_name": a.bot_name,
                 "bot_icon": bot.icon if bot else "",
@@ -192,28 +421,35 @@ class GameEngine:
 
         awards = None
         if self.game_over:
-            ranked = sorted(self.bots, key=lambda b: b.net_worth(self.assets), reverse=True)
-            winner = ranked[0]
+            winner_nw, winner = ranked[0]
             most_active = max(self.bots, key=lambda b: b.trades_made)
             trash_talker = max(self.bots, key=lambda b: b.taunts_given)
             best_trade = max(self.bots, key=lambda b: b.best_trade_pnl)
             worst_trade = min(self.bots, key=lambda b: b.worst_trade_pnl)
-            biggest_loser = ranked[-1]
+            loser_nw, biggest_loser = ranked[-1] if not self.population else min(worths, key=itemgetter(0))
+            risk_adjusted = max(self.bots, key=lambda b: b.risk.sharpe)
+            deepest_dip = max(self.bots, key=lambda b: b.risk.max_drawdown)
             awards = {
                 "champion": {"name": winner.name, "icon": winner.icon, "color": winner.color,
-                             "net_worth": round(winner.net_worth(self.assets), 2),
-                             "pnl": round(winner.net_worth(self.assets) - STARTING_CASH, 2)},
+                             "net_worth": round(winner_nw, 2),
+                             "pnl": round(winner_nw - STARTING_CASH, 2)},
                 "most_active": {"name": most_active.name, "icon": most_active.icon, "trades": most_active.trades_made},
                 "trash_talker": {"name": trash_talker.name, "icon": trash_talker.icon, "taunts": trash_talker.taunts_given},
                 "best_trade": {"name": best_trade.name, "icon": best_trade.icon, "pnl": round(best_trade.best_trade_pnl, 2)},
                 "worst_trade": {"name": worst_trade.name, "icon": worst_trade.icon, "pnl": round(worst_trade.worst_trade_pnl, 2)},
                 "biggest_loser": {"name": biggest_loser.name, "icon": biggest_loser.icon, "color": biggest_loser.color,
-                                  "pnl": round(biggest_loser.net_worth(self.assets) - STARTING_CASH, 2)},
+                                  "pnl": round(loser_nw - STARTING_CASH, 2)},
+                "best_risk_adjusted": {"name": risk_adjusted.name, "icon": risk_adjusted.icon,
+                                       "sharpe": round(risk_adjusted.risk.sharpe, 3)},
+                "deepest_drawdown": {"name": deepest_dip.name, "icon": deepest_dip.icon,
+                                     "max_drawdown": round(deepest_dip.risk.max_drawdown, 4)},
             }
 
         return {
+            "game_id": self.game_id,
+            "tick": self.ticks,
             "round": self.round,
-            "total_rounds": TOTAL_ROUNDS,
+            "total_rounds": self.total_rounds,
             "game_over": self.game_over,
             "win_reason": self.win_reason,
             "market_mood": round(self.market_mood, 3),
@@ -224,4 +460,75 @@ class GameEngine:
             "new_event": new_event_data,
             "round_actions": actions_data,
             "awards": awards,
+            "population": self._population_summary(worths) if self.population else None,
+            "win_odds": self.win_odds,
+        }
+
+    def history_buffer(self, asset: str | None = None, bot: str | None = None):
+        """(values, index) behind an asset's per-sub-tick prices or a bot's per-round net worth.
+
+        Entries are only ever appended, and compaction only rewrites the head
+        that `index` describes (see series.compact), so anything after it is final.
+        """
+        if asset is not None:
+            a = self.assets.get(asset)
+            return (a.history, a.history_index) if a else None
+        b = self.bots_by_name.get(bot)
+        return (b.net_worth_history, b.net_worth_index) if b else None
+
+    def memory_bytes(self) -> int:
+        """Rough bytes held by what grows with the game: histories, candles, bots, actions."""
+        size = sys.getsizeof
+        total = len(self.round_actions) * ACTION_BYTES + self.book.nbytes()
+        for a in self.assets.values():
+            total += size(a.history) + size(a.history_index) + (len(a.candles) + 1) * CANDLE_BYTES
+        for b in self.bots:
+            total += BOT_BYTES + size(b.net_worth_history) + size(b.net_worth_index) + size(b.held)
+        return total
+
+    def compact(self) -> int:
+        """Downsample old price and net-worth history in place; returns entries freed."""
+        freed = 0
+        for a in self.assets.values():
+            freed += compact(a.history, a.history_index, COMPACT_KEEP_TICKS, COMPACT_POINTS)
+        for b in self.bots:
+            freed += compact(b.net_worth_history, b.net_worth_index, COMPACT_KEEP_ROUNDS, COMPACT_ROUND_POINTS)
+        if freed:
+            self.compactions += 1
+        return freed
+
+    def series(self, symbol: str, width: int, kind: str = "line"):
+        """One asset's chart at a given pixel width: LTTB line or merged round candles."""
+        asset = self.assets[symbol]
+        if kind == "ohlc":
+            candles = asset.candles + ([asset.candle] if asset.candle else [])
+            merged, per_bucket = merge_candles(candles, width)
+            return {"asset": symbol, "kind": "ohlc", "rounds_per_candle": per_bucket,
+                    "candles": [[round(v, 2) for v in c] for c in merged]}
+        values = asset.history + array("d", (asset.price,))
+        positions = original_positions(asset.history_index, len(values))
+        xs, ys = lttb(values, width, positions)
+        if positions:
+            xs = [positions[i] for i in xs]
+        return {"asset": symbol, "kind": "line", "points": original_length(values, asset.history_index),
+                "x": xs, "y": [round(v, 2) for v in ys]}
+
+    def _population_summary(self, worths):
+        groups = {}
+        for nw, bot in worths:
+            g = groups.get(bot.personality.value)
+            if g is None:
+                g = groups[bot.personality.value] = {"count": 0, "total": 0.0, "best": nw, "best_name": bot.name}
+            g["count"] += 1
+            g["total"] += nw
+            if nw > g["best"]:
+                g["best"], g["best_name"] = nw, bot.name
+        return {
+            "size": len(worths),
+            "shown": min(len(worths), POPULATION_TOP_K),
+            "by_personality": {
+                p: {"count": g["count"], "avg_net_worth": round(g["total"] / g["count"], 2),
+                    "best": g["best_name"], "best_net_worth": round(g["best"], 2)}
+                for p, g in groups.items()
+            },
         }
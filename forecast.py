@@ -0,0 +1,144 @@
+"""Monte-Carlo price forecast cones.
+
+Simulates K future paths of every asset in one NumPy batch from the engine's
+current state, with the dynamics of Asset.tick: volatility shock, trend pull,
+market mood (re-rolled per path each round), 5-sample mean reversion, the
+0.50 floor, and the impact of events already scheduled (including follow-ups).
+New random events are not drawn.
+
+Two shortcuts keep 10,000 paths x 100 steps well inside 100 ms: shocks use
+antithetic pairs (half the normal draws, lower variance), and the trend random
+walk takes its per-round sum at each round boundary instead of 30 tiny steps,
+which has the same distribution at round ends.
+"""
+
+import numpy as np
+
+from config import (TICKS_PER_ROUND, FORECAST_PATHS, FORECAST_STEPS, FORECAST_POINTS,
+                    FORECAST_PERCENTILES)
+from series import original_length
+
+PRICE_FLOOR = 0.50
+
+
+def event_impacts(engine, symbols: list, steps: int) -> np.ndarray:
+    """(steps, assets) summed price_impact of scheduled events live at each future sub-tick."""
+    col = {sym: i for i, sym in enumerate(symbols)}
+    out = np.zeros((steps, len(symbols)), dtype=np.float32)
+    now = engine.ticks
+
+    def add(target, impact, start, end):
+        lo, hi = max(start, now) - now, min(end, now + steps) - now
+        if lo >= hi:
+            return
+        if target == "ALL":
+            out[lo:hi] += impact
+        elif target in col:
+            out[lo:hi, col[target]] += impact
+
+    for entry in engine.scheduler.entries():
+        ev = entry.event
+        add(ev.target_asset, ev.price_impact, entry.start, entry.end)
+        then = entry.then
+        if then:
+            start = entry.end + then.get("delay", 0)
+            add(then["target_asset"], then["price_impact"], start,
+                start + (then["duration"] + 1) * TICKS_PER_ROUND)
+    return out
+
+
+def simulate(engine, symbols: list | None = None, paths: int = FORECAST_PATHS, steps: int = FORECAST_STEPS,
+             points: int = FORECAST_POINTS, percentiles=FORECAST_PERCENTILES, seed: int | None = None) -> dict:
+    """Percentile bands of simulated prices, sampled at up to `points` future sub-ticks.
+
+    x positions continue the history index (the current price sits at
+    len(history)), so bands line up with /api/tick and /api/series charts.
+    """
+    symbols = [s for s in (symbols or engine.assets) if s in engine.assets]
+    assets = [engine.assets[s] for s in symbols]
+    n = len(assets)
+    half = (paths + 1) // 2
+    k = half * 2
+    scale = 1.0 / TICKS_PER_ROUND
+    rng = np.random.default_rng(seed)
+
+    price = np.empty((n, k), dtype=np.float32)
+    price[:] = np.array([a.price for a in assets], dtype=np.float32)[:, None]
+    trend = np.empty((n, k), dtype=np.float32)
+    trend[:] = np.array([a.trend for a in assets], dtype=np.float32)[:, None]
+    shock_sd = (np.array([a.volatility for a in assets], dtype=np.float32) * 0.05 * scale ** 0.5)[:, None]
+    mood = np.full(k, engine.market_mood, dtype=np.float32)
+    impacts = event_impacts(engine, symbols, steps)
+
+    # Ring of the last 5 pre-tick prices for the reversion term
+    hist_len = len(assets[0].history) if assets else 0
+    ring = np.zeros((5, n, k), dtype=np.float32)
+    for j, past in enumerate(range(-4, 0)):
+        if hist_len + past >= 0:
+            ring[j + 1] = np.array([a.history[past] for a in assets], dtype=np.float32)[:, None]
+    ring_sum = ring.sum(axis=0)
+
+    record_at = np.unique(np.linspace(0, steps - 1, min(points, steps)).astype(int))
+    recorded = np.empty((len(record_at), n, k), dtype=np.float32)
+    z = np.empty((n, k), dtype=np.float32)
+    tmp = np.empty((n, k), dtype=np.float32)
+    revert = 0.01 * scale
+    drift = None
+    drift_rev = None
+    r = 0
+    sub_tick = engine.sub_tick
+    for i in range(steps):
+        if (sub_tick + i) % TICKS_PER_ROUND == 0:
+            # New round: engine re-rolls the mood; trend gets a round's worth of drift
+            mood += rng.standard_normal(k, dtype=np.float32) * 0.15
+            np.clip(mood, -1, 1, out=mood)
+            mood *= 0.9
+            trend += rng.standard_normal((n, k), dtype=np.float32) * (0.05 * scale * TICKS_PER_ROUND ** 0.5)
+            np.clip(trend, -1, 1, out=trend)
+            drift = None
+
+        slot = i % 5   # oldest entry (slot 0 starts empty), replaced by the current price
+        ring_sum -= ring[slot]
+        ring_sum += price
+        ring[slot] = price
+        hist_len += 1
+        rev = revert if hist_len > 5 else 0.0
+
+        # Per-price drift (trend pull + mood - reversion) only changes on round boundaries
+        if drift is None or drift_rev != rev:
+            drift = trend * (0.002 * scale) + (mood * (0.01 * scale) - rev)
+            drift_rev = rev
+
+        # price += price * (shock + drift + event) + reversion toward the 5-sample mean
+        draw = rng.standard_normal((n, half), dtype=np.float32)
+        z[:, :half] = draw
+        np.negative(draw, out=z[:, half:])
+        z *= shock_sd
+        z += drift
+        z += (impacts[i] * scale)[:, None]
+        z *= price
+        price += z
+        if rev:
+            np.multiply(ring_sum, 0.2 * rev, out=tmp)
+            price += tmp
+        np.maximum(price, PRICE_FLOOR, out=price)
+
+        if r < len(record_at) and record_at[r] == i:
+            recorded[r] = price
+            r += 1
+
+    recorded.sort(axis=-1)
+    ranks = [min(k - 1, int(round(q / 100 * (k - 1)))) for q in percentiles]
+    bands = recorded[..., ranks]   # (points, assets, percentiles)
+    base = original_length(assets[0].history, assets[0].history_index) if assets else 0
+    return {
+        "paths": k,
+        "steps": steps,
+        "percentiles": list(percentiles),
+        "x": [base] + [base + int(i) + 1 for i in record_at],
+        "bands": {
+            sym: {f"p{q}": [round(a.price, 2)] + [round(float(v), 2) for v in bands[:, j, qi]]
+                  for qi, q in enumerate(percentiles)}
+            for j, (sym, a) in enumerate(zip(symbols, assets))
+        },
+    }
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""HTTP load test: simulated spectators hammering the Flask app.
+
+Each spectator follows the browser loop in static/js/game.js:
+POST /api/new_game once, POST /api/tick every 4s and GET /api/prices every 3s.
+The app runs in-process on a threaded WSGI server against a local stand-in
+price feed, so no traffic reaches CoinGecko.
+
+    python loadtest.py --clients 1,10,50,100 --duration 30
+    python loadtest.py --url http://127.0.0.1:5000 --clients 20
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import prices
+
+TICK_INTERVAL = 4.0
+PRICE_INTERVAL = 3.0
+ENDPOINTS = ("/api/new_game", "/api/tick", "/api/prices")
+
+
+# ─── STAND-IN PRICE FEED ─────────────────────────────────────
+class _FeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.lock:
+            for cg_id, price in self.server.quotes.items():
+                self.server.quotes[cg_id] = max(0.5, price * (1 + random.gauss(0, 0.001)))
+            body = json.dumps({cg_id: {"usd": p} for cg_id, p in self.server.quotes.items()}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def start_price_feed():
+    """Serve CoinGecko-shaped quotes on localhost. Returns (server, url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.quotes = {cg_id: prices.FALLBACK[sym] for sym, cg_id in prices.COIN_IDS.items()}
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/simple/price"
+
+
+def start_app(feed_url, admission: bool = False):
+    """Run app.py on a threaded werkzeug server. Returns (server, base_url).
+
+    Admission control is off unless asked for: every spectator connects from
+    127.0.0.1, so they would all share one client bucket and the run would
+    measure the rate limiter rather than the engine.
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    prices.COINGECKO_URL = feed_url
+    prices._cache = {}
+    prices._cache_time = 0
+    import app as app_module
+    app_module.admission.enabled = admission
+
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# ─── SPECTATORS ──────────────────────────────────────────────
+class Spectator(threading.Thread):
+    """One browser tab: new game, then interleaved tick/price polling."""
+
+    def __init__(self, base_url, deadline, samples, speedup):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.deadline = deadline
+        self.samples = samples
+        self.tick_every = TICK_INTERVAL / speedup
+        self.price_every = PRICE_INTERVAL / speedup
+        self.session = requests.Session()
+
+    def _call(self, method, path):
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, self.base_url + path, timeout=30)
+            ok = resp.ok
+        except requests.RequestException:
+            ok = False
+        self.samples.append((path, time.perf_counter() - start, ok))
+
+    def run(self):
+        # Tabs open at random moments, not in lockstep
+        time.sleep(random.uniform(0, self.tick_every))
+        self._call("POST", "/api/new_game")
+        self._call("POST", "/api/tick")
+        now = time.monotonic()
+        next_tick = now + self.tick_every
+        next_price = now + self.price_every
+        while True:
+            wake = min(next_tick, next_price)
+            if wake >= self.deadline:
+                return
+            time.sleep(max(0.0, wake - time.monotonic()))
+            if next_tick <= next_price:
+                self._call("POST", "/api/tick")
+                next_tick += self.tick_every
+            else:
+                self._call("GET", "/api/prices")
+                next_price += self.price_every
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def run_level(base_url, clients, duration, speedup):
+    """Run `clients` spectators for `duration` seconds; return per-endpoint stats."""
+    samples = []
+    deadline = time.monotonic() + duration
+    started = time.monotonic()
+    spectators = [Spectator(base_url, deadline, samples, speedup) for _ in range(clients)]
+    for s in spectators:
+        s.start()
+    for s in spectators:
+        s.join()
+    elapsed = time.monotonic() - started
+
+    stats = {}
+    for path in ENDPOINTS:
+        lat = sorted(l for p, l, _ in samples if p == path)
+        errors = sum(1 for p, _, ok in samples if p == path and not ok)
+        stats[path] = {
+            "requests": len(lat),
+            "errors": errors,
+            "rps": len(lat) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(lat, 50) * 1000,
+            "p95_ms": percentile(lat, 95) * 1000,
+            "p99_ms": percentile(lat, 99) * 1000,
+            "max_ms": (lat[-1] * 1000) if lat else 0.0,
+        }
+    return stats
+
+
+def print_level(clients, stats):
+    print(f"\n  CLIENTS: {clients}")
+    print(f"  {'ENDPOINT':<16} {'REQS':>6} {'ERR':>5} {'REQ/S':>8} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9} {'MAX ms':>9}")
+    print(f"  {'─'*16} {'─'*6} {'─'*5} {'─'*8} {'─'*9} {'─'*9} {'─'*9} {'─'*9}")
+    for path, s in stats.items():
+        print(f"  {path:<16} {s['requests']:>6} {s['errors']:>5} {s['rps']:>8.1f} "
+              f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test Trading Bot Wars with simulated spectators.")
+    parser.add_argument("--clients", default="1,5,10,25,50",
+                        help="comma-separated spectator counts, run in order (default: 1,5,10,25,50)")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level (default: 20)")
+    parser.add_argument("--speedup", type=float, default=1.0,
+                        help="divide the 4s/3s polling intervals by this factor (default: 1)")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--admission", action="store_true",
+                        help="keep admission control on in the started server (all spectators share one client bucket)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    levels = [int(n) for n in args.clients.split(",") if n.strip()]
+    servers = []
+    base_url = args.url
+    if not base_url:
+        feed, feed_url = start_price_feed()
+        app_server, base_url = start_app(feed_url, args.admission)
+        servers = [app_server, feed]
+
+    results = {}
+    try:
+        for clients in levels:
+            stats = run_level(base_url.rstrip("/"), clients, args.duration, args.speedup)
+            results[clients] = stats
+            if not args.json:
+                print_level(clients, stats)
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""In-process metrics with Prometheus text exposition.
+
+Everything here is a no-op unless METRICS_ENABLED is set (or a clock
+listener such as the slow-tick profiler is registered), so the hot path
+only pays for an attribute check and a shared null clock in tick().
+"""
+
+import threading
+import time
+import weakref
+
+from config import METRICS_ENABLED
+
+enabled = METRICS_ENABLED
+
+PREFIX = "botwars_"
+TIME_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BYTES_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+# name -> (type, help, buckets)
+DEFINITIONS = {
+    "tick_seconds": ("histogram", "Wall time of GameEngine.tick().", TIME_BUCKETS),
+    "tick_phase_seconds": ("histogram", "Wall time of each GameEngine.tick() phase.", TIME_BUCKETS),
+    "strategy_decision_seconds": ("histogram", "Wall time of one strategies.decide() call.", TIME_BUCKETS),
+    "response_bytes": ("histogram", "Size of JSON responses.", BYTES_BUCKETS),
+    "price_fetch_seconds": ("histogram", "Latency of upstream CoinGecko requests.", TIME_BUCKETS),
+    "price_cache_requests_total": ("counter", "fetch_prices() calls by cache outcome.", None),
+    "http_requests_total": ("counter", "API requests by endpoint.", None),
+    "tick_coalesced_total": ("counter", "Tick requests answered without advancing the game.", None),
+    "admission_rejected_total": ("counter", "Engine requests turned away, by endpoint and reason.", None),
+    "history_compacted_total": ("counter", "History entries freed by over-budget compaction.", None),
+    "games_evicted_total": ("counter", "Games dropped from the registry, by reason.", None),
+    "store_rows_dropped_total": ("counter", "Result rows the store could not write, by reason.", None),
+    "plugin_decisions_total": ("counter", "Plugin decisions by plugin and outcome.", None),
+    "plugin_wait_seconds": ("histogram", "Time GameEngine.step() waited on plugin decisions.", TIME_BUCKETS),
+}
+
+_lock = threading.Lock()
+_histograms = {}   # (name, labels) -> [bucket counts..., sum, count]
+_counters = {}     # (name, labels) -> value
+_games = weakref.WeakSet()
+clock_listeners = []   # callables(clock, engine) run after every timed tick
+
+
+def set_enabled(flag: bool):
+    global enabled
+    enabled = bool(flag)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels):
+    if not enabled:
+        return
+    buckets = DEFINITIONS[name][2]
+    key = _key(name, labels)
+    with _lock:
+        h = _histograms.get(key)
+        if h is None:
+            h = _histograms[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                h[i] += 1
+                break
+        h[-2] += value
+        h[-1] += 1
+
+
+def track_game(engine):
+    """Register a GameEngine so the live-games gauge can count it."""
+    if enabled:
+        _games.add(engine)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+# ─── TICK PHASE CLOCK ────────────────────────────────────────
+class PhaseClock:
+    """Splits one tick into consecutive phases: each lap() closes the phase since the last mark."""
+
+    __slots__ = ("start", "last", "phases", "strategies", "thread_id")
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+        self.strategies = []
+        self.thread_id = threading.get_ident()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self.last)
+        self.last = now
+
+    def lap_strategy(self, personality: str):
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.strategies.append((personality, elapsed))
+        self.phases["strategies"] = self.phases.get("strategies", 0.0) + elapsed
+        self.last = now
+
+    @property
+    def total(self) -> float:
+        return self.last - self.start
+
+    def finish(self, engine=None):
+        if enabled:
+            observe("tick_seconds", self.total)
+            for phase, seconds in self.phases.items():
+                observe("tick_phase_seconds", seconds, phase=phase)
+            for personality, seconds in self.strategies:
+                observe("strategy_decision_seconds", seconds, personality=personality)
+        for listener in clock_listeners:
+            listener(self, engine)
+
+
+class _NullClock:
+    __slots__ = ()
+    phases = {}
+
+    def lap(self, phase):
+        pass
+
+    def lap_strategy(self, personality):
+        pass
+
+    def finish(self, engine=None):
+        pass
+
+
+NULL_CLOCK = _NullClock()
+
+
+def tick_clock():
+    return PhaseClock() if enabled or clock_listeners else NULL_CLOCK
+
+
+# ─── EXPOSITION ──────────────────────────────────────────────
+def _fmt_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _fmt_num(v):
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def render() -> str:
+    """Return all metrics in Prometheus text format (version 0.0.4)."""
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for name, (kind, help_text, buckets) in DEFINITIONS.items():
+        full = PREFIX + name
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        if kind == "counter":
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{full}{_fmt_labels(labels)} {_fmt_num(value)}")
+            continue
+        for (n, labels), h in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, h):
+                cumulative += count
+                lines.append(f"{full}_bucket{_fmt_labels(labels, ('le', _fmt_num(float(bound))))} {cumulative}")
+            lines.append(f"{full}_bucket{_fmt_labels(labels, ('le', '+Inf'))} {h[-1]}")
+            lines.append(f"{full}_sum{_fmt_labels(labels)} {_fmt_num(h[-2])}")
+            lines.append(f"{full}_count{_fmt_labels(labels)} {h[-1]}")
+
+    hits = sum(v for (n, labels), v in counters.items() if n == "price_cache_requests_total" and ("result", "hit") in labels)
+    total = sum(v for (n, _), v in counters.items() if n == "price_cache_requests_total")
+    lines.append(f"# HELP {PREFIX}price_cache_hit_ratio Share of fetch_prices() calls served from cache.")
+    lines.append(f"# TYPE {PREFIX}price_cache_hit_ratio gauge")
+    lines.append(f"{PREFIX}price_cache_hit_ratio {_fmt_num(hits / total if total else 0.0)}")
+    lines.append(f"# HELP {PREFIX}live_games GameEngine instances still referenced.")
+    lines.append(f"# TYPE {PREFIX}live_games gauge")
+    lines.append(f"{PREFIX}live_games {len(_games)}")
+    return "\n".join(lines) + "\n"
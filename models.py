@@ -1,12 +1,31 @@
-"""Data models: Asset, MarketEvent, TradeAction, Bot."""
+"""Data models: Asset, MarketEvent, TradeAction, Bot.
+
+All are slotted. Assets carry an integer id (their position in the engine's
+universe). A Bot's cash, holdings and cost live in its row of the game's
+fixed-point Book (see book.py), indexed by that id; the Bot itself keeps the
+list of assets it currently holds, so trading and valuation never hash a
+symbol.
+"""
 
 import random
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
 
+from analytics import RiskStats
+from book import SCALE, Book
+from commentary import render
 from config import BOT_PROFILES
 
 
+PROFILE_DISPLAY_KEYS = ("name", "icon", "color", "motto")
+
+
+def profile_params(personality: str) -> dict:
+    """The strategy parameters of a BOT_PROFILES entry (everything but display fields)."""
+    return {k: v for k, v in BOT_PROFILES[personality].items() if k not in PROFILE_DISPLAY_KEYS}
+
+
 class BotPersonality(Enum):
     AGGRESSIVE = "aggressive"
     CAUTIOUS = "cautious"
@@ -17,37 +36,70 @@ class BotPersonality(Enum):
     WHALE = "whale"
     SCALPER = "scalper"
     DIAMOND_HANDS = "diamond_hands"
+    PLUGIN = "plugin"               # trades through a user plugin (plugins.py), never spawned by default
+
 
+# The personalities with a strategy in strategies.py
+BUILTIN_PERSONALITIES = tuple(p for p in BotPersonality if p is not BotPersonality.PLUGIN)
 
-@dataclass
+
+@dataclass(slots=True, eq=False)
 class Asset:
     symbol: str
     name: str
     price: float
     volatility: float
     trend: float
-    history: list = field(default_factory=list)
+    id: int = 0                     # column in the Book's holdings, cost and prices
+    history: array = field(default_factory=lambda: array("d"))    # price before each sub-tick
+    history_index: array = field(default_factory=lambda: array("q"))   # see series.compact
+    candles: list = field(default_factory=list)   # closed per-round [open, high, low, close]
+    candle: list | None = None                    # the round in progress
 
-    def tick(self, market_mood: float, events: list, ticks_per_round: int = 1):
+    def tick(self, market_mood: float, event_impact: float, ticks_per_round: int = 1):
+        """event_impact is the summed price_impact of active events targeting this asset or ALL."""
         self.history.append(self.price)
         scale = 1.0 / ticks_per_round
         shock = random.gauss(0, self.volatility * self.price * 0.05 * (scale ** 0.5))
         trend_pull = self.trend * self.price * 0.002 * scale
         mood_effect = market_mood * self.price * 0.01 * scale
-        event_effect = 0
-        for ev in events:
-            if ev.target_asset == self.symbol or ev.target_asset == "ALL":
-                event_effect += ev.price_impact * self.price * scale
+        event_effect = event_impact * self.price * scale
         if len(self.history) > 5:
             avg = sum(self.history[-5:]) / 5
             reversion = (avg - self.price) * 0.01 * scale
         else:
             reversion = 0
+        prev = self.price
         self.price += shock + trend_pull + mood_effect + event_effect + reversion
         self.price = max(0.50, self.price)
+        self._update_candle(prev)
         self.trend += random.gauss(0, 0.05 * scale)
         self.trend = max(-1, min(1, self.trend))
 
+    def quote(self, price: float):
+        """Move to an externally supplied price (backtest tapes) instead of the random walk."""
+        prev = self.price
+        self.history.append(prev)
+        self.price = price
+        self._update_candle(prev)
+
+    def _update_candle(self, prev: float):
+        price = self.price
+        c = self.candle
+        if c is None:
+            self.candle = [prev, max(prev, price), min(prev, price), price]
+        else:
+            if price > c[1]:
+                c[1] = price
+            elif price < c[2]:
+                c[2] = price
+            c[3] = price
+
+    def close_candle(self):
+        if self.candle is not None:
+            self.candles.append(self.candle)
+            self.candle = None
+
     @property
     def change_pct(self):
         if len(self.history) < 1:
@@ -55,7 +107,7 @@ class Asset:
         return ((self.price - self.history[-1]) / self.history[-1]) * 100
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketEvent:
     name: str
     description: str
@@ -64,82 +116,153 @@ class MarketEvent:
     duration: int
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class TradeAction:
     bot_name: str
     action: str
     asset: str
     amount: int
     price: float
-    commentary: str
+    note: int               # commentary template id (commentary.NONE for none)
+    args: tuple = ()        # its arguments
 
+    @property
+    def commentary(self) -> str:
+        """The rendered line; only built when something displays it."""
+        return render(self.note, self.args)
 
-@dataclass
+
+# Recycled TradeActions. Engines only return actions here when pool_actions is
+# set (headless drivers that never keep an action past the next sub-tick).
+_action_pool: list = []
+ACTION_POOL_MAX = 4096
+
+
+def new_action(bot_name: str, action: str, asset: str, amount: int, price: float, note: int,
+               args: tuple = ()) -> TradeAction:
+    """A TradeAction, reusing a recycled record when one is free."""
+    try:
+        a = _action_pool.pop()
+    except IndexError:
+        return TradeAction(bot_name, action, asset, amount, price, note, args)
+    a.bot_name = bot_name
+    a.action = action
+    a.asset = asset
+    a.amount = amount
+    a.price = price
+    a.note = note
+    a.args = args
+    return a
+
+
+def recycle_actions(actions: list):
+    """Hand back actions nobody will read again."""
+    room = ACTION_POOL_MAX - len(_action_pool)
+    if room >= len(actions):
+        _action_pool.extend(actions)
+    elif room > 0:
+        _action_pool.extend(actions[:room])
+
+
+@dataclass(slots=True, eq=False)
 class Bot:
     personality: BotPersonality
-    cash: float
-    holdings: dict = field(default_factory=dict)
-    net_worth_history: list = field(default_factory=list)
+    book: Book                      # the game's accounts; this bot owns row `row`
+    row: int = 0
+    net_worth_history: array = field(default_factory=lambda: array("d"))   # one entry per round
+    net_worth_index: array = field(default_factory=lambda: array("q"))     # see series.compact
     kills: int = 0
     taunts_given: int = 0
     trades_made: int = 0
     best_trade_pnl: float = 0
     worst_trade_pnl: float = 0
-    cost_basis: dict = field(default_factory=dict)
+    held: list = field(default_factory=list)    # Assets with an open position, in the order opened
+    label: str = ""                 # population-mode suffix, e.g. "#0042"
+    params: dict = None             # strategy parameter overrides; profile values fill the rest
+    plugin: str = ""                # plugins.py strategy that decides for this bot
+    # Resolved once in __post_init__ instead of a BOT_PROFILES lookup per access
+    base: int = field(init=False)   # offset of this bot's row in book.holdings / book.cost
+    name: str = field(init=False)
+    color: str = field(init=False)
+    icon: str = field(init=False)
+    motto: str = field(init=False)
+    risk: RiskStats = field(init=False)
+
+    def __post_init__(self):
+        self.base = self.row * self.book.n_assets
+        profile = BOT_PROFILES[self.personality.value]
+        self.name = f"{profile['name']} {self.label}" if self.label else profile["name"]
+        self.color = profile["color"]
+        self.icon = profile["icon"]
+        self.motto = profile["motto"]
+        self.params = profile_params(self.personality.value) | (self.params or {})
+        self.risk = RiskStats(self.cash)
 
     @property
     def profile(self):
         return BOT_PROFILES[self.personality.value]
 
     @property
-    def name(self):
-        return self.profile["name"]
+    def cash(self) -> float:
+        return self.book.cash[self.row] / SCALE
 
-    @property
-    def color(self):
-        return self.profile["color"]
+    def holding(self, asset: Asset) -> int:
+        return self.book.holdings[self.base + asset.id]
 
-    @property
-    def icon(self):
-        return self.profile["icon"]
+    def cost_basis(self, asset: Asset) -> float:
+        """Average entry price of the open position in `asset`, 0.0 when flat."""
+        held = self.holding(asset)
+        return self.book.cost[self.base + asset.id] / held / SCALE if held else 0.0
 
-    @property
-    def motto(self):
-        return self.profile["motto"]
+    def net_worth(self) -> float:
+        book = self.book
+        holdings, prices, base = book.holdings, book.prices, self.base
+        total = book.cash[self.row]
+        for asset in self.held:
+            total += holdings[base + asset.id] * prices[asset.id]
+        return total / SCALE
 
-    def net_worth(self, assets: dict) -> float:
-        total = self.cash
-        for sym, qty in self.holdings.items():
-            total += qty * assets[sym].price
-        return total
+    def positions(self) -> dict:
+        """Open positions as symbol -> units, for display."""
+        holdings, base = self.book.holdings, self.base
+        return {asset.symbol: holdings[base + asset.id] for asset in self.held}
 
     def execute_buy(self, asset: Asset, qty: int):
-        cost = qty * asset.price
-        if cost > self.cash or qty <= 0:
+        book = self.book
+        cost = qty * book.prices[asset.id]
+        if cost > book.cash[self.row] or qty <= 0:
             return False
-        prev_qty = self.holdings.get(asset.symbol, 0)
-        prev_cost = self.cost_basis.get(asset.symbol, 0)
-        self.cash -= cost
-        self.holdings[asset.symbol] = prev_qty + qty
-        total_cost = prev_cost * prev_qty + cost
-        self.cost_basis[asset.symbol] = total_cost / (prev_qty + qty) if (prev_qty + qty) > 0 else 0
+        k = self.base + asset.id
+        if not book.holdings[k]:
+            self.held.append(asset)
+        book.cash[self.row] -= cost
+        book.holdings[k] += qty
+        book.cost[k] += cost
         self.trades_made += 1
+        self.risk.trade(cost / SCALE)
         return True
 
     def execute_sell(self, asset: Asset, qty: int):
-        held = self.holdings.get(asset.symbol, 0)
+        book = self.book
+        k = self.base + asset.id
+        held = book.holdings[k]
         qty = min(qty, held)
         if qty <= 0:
             return False
-        revenue = qty * asset.price
-        pnl = (asset.price - self.cost_basis.get(asset.symbol, asset.price)) * qty
-        self.best_trade_pnl = max(self.best_trade_pnl, pnl)
-        self.worst_trade_pnl = min(self.worst_trade_pnl, pnl)
-        self.cash += revenue
-        self.holdings[asset.symbol] = held - qty
-        if self.holdings[asset.symbol] == 0:
-            del self.holdings[asset.symbol]
-            if asset.symbol in self.cost_basis:
-                del self.cost_basis[asset.symbol]
+        revenue = qty * book.prices[asset.id]
+        # The sold share of the position's cost, floored; what is left stays on
+        # the units still held, and selling out releases exactly the rest
+        cost = book.cost[k] * qty // held
+        pnl = (revenue - cost) / SCALE
+        if pnl > self.best_trade_pnl:
+            self.best_trade_pnl = pnl
+        if pnl < self.worst_trade_pnl:
+            self.worst_trade_pnl = pnl
+        book.cash[self.row] += revenue
+        book.holdings[k] = held - qty
+        book.cost[k] -= cost
+        if held == qty:
+            self.held.remove(asset)
         self.trades_made += 1
+        self.risk.trade(revenue / SCALE)
         return True
@@ -0,0 +1,112 @@
+"""Live win probabilities from seeded rollouts of the current game.
+
+At the start of each round the engine is pickled and ODDS_ROLLOUTS copies are
+played to the end on a process pool (offline prices, normal strategies), in
+batches of ODDS_BATCH. Each finished batch is folded into the running tally
+and published on engine.win_odds, so estimates sharpen as the round goes on
+and spectators only ever read a dict. A new round cancels whatever is still
+queued from the previous one; the old estimate stays up, flagged stale, until
+the first new batch lands.
+"""
+
+import multiprocessing
+import pickle
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from config import ODDS_ENABLED, ODDS_ROLLOUTS, ODDS_BATCH, ODDS_WORKERS
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded Flask process is not safe
+            _pool = ProcessPoolExecutor(max_workers=ODDS_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def play_out(blob: bytes, seeds) -> tuple:
+    """Play the pickled engine to the end once per seed; returns (games, wins, target hits) by bot name."""
+    wins, hits = Counter(), Counter()
+    for seed in seeds:
+        random.seed(seed)
+        engine = pickle.loads(blob)
+        engine.live_prices = False
+        engine.pool_actions = True
+        engine.run_plugins = False
+        while not engine.game_over:
+            engine.step()
+        worths = [(b.net_worth(), b.name) for b in engine.bots]
+        wins[max(worths)[1]] += 1
+        for nw, name in worths:
+            if nw >= engine.win_target:
+                hits[name] += 1
+    return len(seeds), wins, hits
+
+
+class WinOdds:
+    """Per-game rollout scheduler; call update() after every tick."""
+
+    def __init__(self, engine, rollouts: int = ODDS_ROLLOUTS, batch: int = ODDS_BATCH):
+        self.engine = engine
+        self.rollouts = rollouts
+        self.batch = batch
+        self.round = None
+        self.games = 0
+        self.wins = Counter()
+        self.hits = Counter()
+        self.futures = []
+        self._lock = threading.Lock()
+
+    def update(self):
+        """Start rollouts for a round we have not sampled yet. Cheap when nothing changed."""
+        engine = self.engine
+        if not ODDS_ENABLED or engine.game_over or engine.round == self.round or engine.round == 0:
+            return
+        self.cancel()
+        with self._lock:
+            self.round = engine.round
+            self.games = 0
+            self.wins = Counter()
+            self.hits = Counter()
+        if engine.win_odds:
+            engine.win_odds = engine.win_odds | {"stale": True}
+
+        blob = pickle.dumps(engine, protocol=pickle.HIGHEST_PROTOCOL)
+        base = (int(engine.game_id, 16) + engine.round * 1_000_003) % (2 ** 32)
+        pool = _executor()
+        for start in range(0, self.rollouts, self.batch):
+            seeds = range(base + start, base + min(start + self.batch, self.rollouts))
+            fut = pool.submit(play_out, blob, seeds)
+            fut.add_done_callback(lambda f, rnd=engine.round: self._collect(rnd, f))
+            self.futures.append(fut)
+
+    def _collect(self, rnd: int, fut):
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        games, wins, hits = fut.result()
+        with self._lock:
+            if rnd != self.round:
+                return
+            self.games += games
+            self.wins.update(wins)
+            self.hits.update(hits)
+            n = self.games
+            self.engine.win_odds = {
+                "round": rnd,
+                "rollouts": n,
+                "stale": False,
+                "bots": {name: {"win": round(self.wins[name] / n, 3), "target": round(self.hits[name] / n, 3)}
+                         for name in set(self.wins) | set(self.hits)},
+            }
+
+    def cancel(self):
+        for fut in self.futures:
+            fut.cancel()
+        self.futures = []
@@ -0,0 +1,352 @@
+"""User strategy plugins, run in a pool of worker processes.
+
+A plugin is a file PLUGIN_DIR/<name>.py defining
+
+    def decide(snapshot: dict) -> list:
+        return [["BUY", "BTC", 2], ["SELL", "ETH", 1]]
+
+The snapshot is a plain copy of the market and of the bot's own account (see
+_market() and _account()). Orders are [action, symbol, units] and go through
+the same Bot.execute_buy / execute_sell as the built-in strategies, so a plugin
+cannot spend cash it does not have.
+
+GameEngine.step() hands this sub-tick's plugin decisions to idle workers
+before it runs the built-in strategies, then waits for them until
+PLUGIN_DEADLINE after handing them out. A plugin that is late, raises, returns
+malformed orders or takes its worker down forfeits the turn. A late or dead
+worker is killed and replaced, so whatever the plugin does, the sub-tick waits
+at most the deadline. Workers stay up between decisions and keep their loaded
+plugins (reloaded when the file changes). Each one runs under rlimits:
+PLUGIN_CPU_SECONDS of CPU per decision, PLUGIN_MEMORY_MB of address space
+beyond its start-up size, and no file writes. Replies come back as JSON, so
+the server never unpickles anything a plugin built.
+
+This contains faults and runaway resource use; it is not a security boundary
+against hostile code, which is why uploads (save()) are admin-only.
+"""
+
+import ast
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:         # not on Windows; workers then run without rlimits
+    resource = None
+
+from commentary import NONE
+from config import (PLUGIN_DIR, PLUGIN_WORKERS, PLUGIN_DEADLINE, PLUGIN_CPU_SECONDS, PLUGIN_MEMORY_MB,
+                    PLUGIN_HISTORY, PLUGIN_MAX_ORDERS, PLUGIN_MAX_BYTES)
+from models import new_action
+import metrics
+
+NAME = re.compile(r"[a-z][a-z0-9_]{0,31}")
+READY = b"ready"
+
+
+# ─── worker process ──────────────────────────────────────────
+
+def _address_space() -> int:
+    """Current virtual size in bytes, 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+    except OSError:
+        return 0
+
+
+def _limit(memory_bytes: int):
+    if resource is None:
+        return
+    base = _address_space()
+    if memory_bytes and base:
+        resource.setrlimit(resource.RLIMIT_AS, (base + memory_bytes, base + memory_bytes))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+
+
+def _cpu_budget(seconds: int):
+    """Let the next decision use `seconds` more CPU before SIGXCPU kills the worker."""
+    if resource is None or not seconds:
+        return
+    used = resource.getrusage(resource.RUSAGE_SELF)
+    soft = math.ceil(used.ru_utime + used.ru_stime) + seconds
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, resource.getrlimit(resource.RLIMIT_CPU)[1]))
+
+
+def _load(cache: dict, name: str):
+    path = os.path.join(PLUGIN_DIR, name + ".py")
+    mtime = os.stat(path).st_mtime_ns
+    hit = cache.get(name)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    spec = importlib.util.spec_from_file_location(f"plugin_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    cache[name] = (mtime, module)
+    return module
+
+
+def _worker(conn, memory_bytes: int, cpu_seconds: int):
+    sys.dont_write_bytecode = True      # RLIMIT_FSIZE=0 would kill the worker on a .pyc write
+    _limit(memory_bytes)
+    loaded = {}
+    conn.send_bytes(READY)
+    while True:
+        try:
+            name, snapshot = conn.recv()
+        except EOFError:
+            return
+        _cpu_budget(cpu_seconds)
+        try:
+            reply = json.dumps({"orders": _load(loaded, name).decide(snapshot)})
+        except Exception as e:
+            reply = json.dumps({"error": f"{type(e).__name__}: {e}"[:200]})
+        conn.send_bytes(reply.encode())
+
+
+# ─── pool ────────────────────────────────────────────────────
+
+class _Worker:
+    __slots__ = ("process", "conn")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class PluginPool:
+    """Up to `size` warm workers shared by every game in the process."""
+
+    def __init__(self, size: int = PLUGIN_WORKERS, deadline: float = PLUGIN_DEADLINE):
+        self.size = size
+        self.deadline = deadline
+        # spawn: forking a threaded Flask process is not safe
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = []             # ready for a decision
+        self._starting = []         # spawned, ready message not seen yet
+        self._busy = 0
+        self._lock = threading.Lock()
+
+    def _spawn(self):
+        conn, child = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker, args=(child, PLUGIN_MEMORY_MB * 2**20, PLUGIN_CPU_SECONDS),
+                                    daemon=True, name="plugin-worker")
+        process.start()
+        child.close()
+        self._starting.append(_Worker(process, conn))
+
+    def warm(self):
+        """Start workers up to the pool size; they come up in the background."""
+        with self._lock:
+            while len(self._idle) + len(self._starting) + self._busy < self.size:
+                self._spawn()
+
+    def _checkout(self) -> _Worker | None:
+        with self._lock:
+            for w in list(self._starting):
+                if not w.conn.poll(0):
+                    continue
+                self._starting.remove(w)
+                try:
+                    w.conn.recv_bytes()
+                    self._idle.append(w)
+                except (EOFError, OSError):
+                    self._kill(w)
+            while len(self._idle) + len(self._starting) + self._busy < self.size:
+                self._spawn()
+            if not self._idle:
+                return None
+            self._busy += 1
+            return self._idle.pop()
+
+    def _release(self, w: _Worker):
+        with self._lock:
+            self._busy -= 1
+            self._idle.append(w)
+
+    def _discard(self, w: _Worker):
+        """Kill a late or broken worker; the next checkout starts its replacement."""
+        with self._lock:
+            self._busy -= 1
+        self._kill(w)
+
+    @staticmethod
+    def _kill(w: _Worker):
+        w.process.kill()
+        w.conn.close()
+
+    def submit(self, calls: list) -> "Batch":
+        """Hand out (plugin, snapshot) decisions; Batch.results() collects them."""
+        batch = Batch(self, calls, time.monotonic() + self.deadline)
+        batch.dispatch()
+        return batch
+
+
+class Batch:
+    """One sub-tick's plugin decisions, sharing one deadline."""
+
+    def __init__(self, pool: PluginPool, calls: list, deadline: float):
+        self.pool = pool
+        self.calls = calls
+        self.deadline = deadline
+        self.queue = list(range(len(calls)))
+        self.waiting = {}       # conn -> (call index, worker)
+        self.outcomes = ["busy"] * len(calls)
+        self.orders = [None] * len(calls)
+
+    def dispatch(self):
+        while self.queue:
+            w = self.pool._checkout()
+            if w is None:
+                return
+            i = self.queue.pop(0)
+            try:
+                w.conn.send(self.calls[i])
+            except (OSError, ValueError):
+                self.pool._discard(w)
+                self.outcomes[i] = "crashed"
+                continue
+            self.waiting[w.conn] = (i, w)
+
+    def results(self) -> list:
+        """(outcome, orders) per call: ok, error, crashed, timeout or busy (no worker free in time)."""
+        while self.waiting:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for conn in wait(list(self.waiting), remaining):
+                i, w = self.waiting.pop(conn)
+                try:
+                    reply = json.loads(conn.recv_bytes(PLUGIN_MAX_BYTES))
+                except (EOFError, OSError, ValueError):
+                    self.pool._discard(w)
+                    self.outcomes[i] = "crashed"
+                    continue
+                self.pool._release(w)
+                if "orders" in reply:
+                    self.outcomes[i], self.orders[i] = "ok", reply["orders"]
+                else:
+                    self.outcomes[i] = "error"
+            self.dispatch()
+        for i, w in self.waiting.values():
+            self.pool._discard(w)
+            self.outcomes[i] = "timeout"
+        self.waiting = {}
+        return list(zip(self.outcomes, self.orders))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool() -> PluginPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PluginPool()
+        return _pool
+
+
+# ─── engine side ─────────────────────────────────────────────
+
+def _market(engine) -> dict:
+    return {
+        "round": engine.round,
+        "tick": engine.ticks,
+        "assets": {
+            sym: {"price": a.price, "change_pct": a.change_pct, "volatility": a.volatility, "trend": a.trend,
+                  "history": a.history[-PLUGIN_HISTORY:].tolist()}
+            for sym, a in engine.assets.items()
+        },
+        "events": [{"name": ev.name, "target_asset": ev.target_asset, "price_impact": ev.price_impact}
+                   for ev in engine.active_events],
+    }
+
+
+def _account(bot) -> dict:
+    return {"bot": bot.name, "cash": bot.cash, "net_worth": bot.net_worth(), "holdings": bot.positions()}
+
+
+def begin(engine, bots: list) -> tuple:
+    """Send the decisions of `bots` (all plugin bots) to the pool; pass the result to finish()."""
+    market = _market(engine)
+    calls = [(bot.plugin, market | _account(bot)) for bot in bots]
+    return bots, pool().submit(calls), time.monotonic()
+
+
+def _valid(orders, assets) -> bool:
+    if not isinstance(orders, list) or len(orders) > PLUGIN_MAX_ORDERS:
+        return False
+    for order in orders:
+        if not (isinstance(order, list) and len(order) == 3):
+            return False
+        action, sym, qty = order
+        if (action not in ("BUY", "SELL") or not isinstance(sym, str) or sym not in assets
+                or type(qty) is not int or qty <= 0):
+            return False
+    return True
+
+
+def finish(engine, pending: tuple) -> list:
+    """Wait out the batch and execute its orders; returns the TradeActions."""
+    bots, batch, started = pending
+    actions = []
+    assets = engine.assets
+    for bot, (outcome, orders) in zip(bots, batch.results()):
+        if outcome == "ok" and not _valid(orders, assets):
+            outcome = "invalid"
+        metrics.inc("plugin_decisions_total", plugin=bot.plugin, outcome=outcome)
+        if outcome != "ok":
+            continue
+        for action, sym, qty in orders:
+            asset = assets[sym]
+            if action == "BUY":
+                done = bot.execute_buy(asset, qty)
+            else:
+                qty = min(qty, bot.holding(asset))
+                done = bot.execute_sell(asset, qty)
+            if done:
+                actions.append(new_action(bot.name, action, sym, qty, asset.price, NONE))
+    metrics.observe("plugin_wait_seconds", time.monotonic() - started)
+    return actions
+
+
+# ─── plugin files ────────────────────────────────────────────
+
+def available() -> list:
+    try:
+        names = os.listdir(PLUGIN_DIR)
+    except FileNotFoundError:
+        return []
+    return sorted(n[:-3] for n in names if n.endswith(".py") and NAME.fullmatch(n[:-3]))
+
+
+def save(name: str, source: str):
+    """Store a plugin after checking it parses and defines decide(); ValueError otherwise.
+
+    The server only parses the source; it runs solely in the workers.
+    """
+    if not NAME.fullmatch(name):
+        raise ValueError("plugin names are lowercase letters, digits and _, at most 32")
+    if len(source.encode()) > PLUGIN_MAX_BYTES:
+        raise ValueError(f"plugin source is over {PLUGIN_MAX_BYTES} bytes")
+    try:
+        tree = ast.parse(source, filename=f"{name}.py")
+    except SyntaxError as e:
+        raise ValueError(f"syntax error on line {e.lineno}: {e.msg}") from None
+    if not any(isinstance(node, ast.FunctionDef) and node.name == "decide" for node in tree.body):
+        raise ValueError("plugin must define decide(snapshot)")
+    os.makedirs(PLUGIN_DIR, exist_ok=True)
+    path = os.path.join(PLUGIN_DIR, name + ".py")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(source)
+    os.replace(tmp, path)
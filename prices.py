@@ -1,9 +1,12 @@
 """Fetch live crypto prices from CoinGecko (free API, no key needed)."""
 
+import os
 import time
 import requests
 
-COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+import metrics
+
+COINGECKO_URL = os.environ.get("COINGECKO_URL", "https://api.coingecko.com/api/v3/simple/price")
 COIN_IDS = {
     "BTC": "bitcoin",
     "ETH": "ethereum",
@@ -32,15 +35,20 @@ def fetch_prices() -> dict[str, float]:
     global _cache, _cache_time
 
     if _cache and (time.time() - _cache_time) < CACHE_TTL:
+        metrics.inc("price_cache_requests_total", result="hit")
         return dict(_cache)
 
     try:
         ids = ",".join(COIN_IDS.values())
-        resp = requests.get(
-            COINGECKO_URL,
-            params={"ids": ids, "vs_currencies": "usd"},
-            timeout=5,
-        )
+        started = time.perf_counter()
+        try:
+            resp = requests.get(
+                COINGECKO_URL,
+                params={"ids": ids, "vs_currencies": "usd"},
+                timeout=5,
+            )
+        finally:
+            metrics.observe("price_fetch_seconds", time.perf_counter() - started)
         resp.raise_for_status()
         data = resp.json()
 
@@ -53,9 +61,12 @@ def fetch_prices() -> dict[str, float]:
 
         _cache = prices
         _cache_time = time.time()
+        metrics.inc("price_cache_requests_total", result="miss")
         return dict(prices)
 
     except Exception:
         if _cache:
+            metrics.inc("price_cache_requests_total", result="stale")
             return dict(_cache)
+        metrics.inc("price_cache_requests_total", result="fallback")
         return dict(FALLBACK)
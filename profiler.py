@@ -0,0 +1,202 @@
+"""Opt-in sampling profiler, slow-tick capture and allocation snapshots.
+
+A daemon thread snapshots every other thread's stack via sys._current_frames()
+at PROFILER_HZ and aggregates them as collapsed ("folded") stacks, the input
+format of flamegraph.pl and speedscope. Any GameEngine.tick() slower than
+SLOW_TICK_MS keeps its phase breakdown plus the samples taken on its thread
+while it ran. allocations() reports tracemalloc's top allocation sites,
+optionally as growth since the previous call.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+
+from config import PROFILER_HZ, SLOW_TICK_MS, SLOW_TICK_KEEP, TRACEMALLOC_FRAMES
+import metrics
+
+_labels = {}   # code object -> "func (file:line)"
+
+
+def _frame_label(code):
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def collapse(frame) -> str:
+    """Root-first, semicolon-joined stack of `frame`."""
+    parts = []
+    while frame is not None:
+        parts.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    parts.reverse()
+    return ";".join(parts)
+
+
+def folded(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class SamplingProfiler:
+    def __init__(self, hz: float = PROFILER_HZ, recent_seconds: float = 30.0):
+        self.interval = 1.0 / hz
+        self.stacks = Counter()
+        # (perf_counter, thread id, stack) for slow-tick lookups
+        self.recent = deque(maxlen=max(1, int(hz * recent_seconds * 4)))
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        with self._lock:
+            self.stacks.clear()
+            self.recent.clear()
+            self.samples = 0
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            frames = sys._current_frames()
+            with self._lock:
+                for tid, frame in frames.items():
+                    if tid == own:
+                        continue
+                    stack = collapse(frame)
+                    self.stacks[stack] += 1
+                    self.recent.append((now, tid, stack))
+                self.samples += 1
+            del frames
+
+    def window(self, thread_id: int, start: float, end: float) -> Counter:
+        """Stacks sampled on `thread_id` between two perf_counter() readings."""
+        with self._lock:
+            return Counter(stack for t, tid, stack in self.recent if tid == thread_id and start <= t <= end)
+
+    def folded(self) -> str:
+        with self._lock:
+            return folded(self.stacks)
+
+
+class SlowTickRecorder:
+    """metrics clock listener that keeps ticks over the latency budget."""
+
+    def __init__(self, sampler: SamplingProfiler, budget_ms: float = SLOW_TICK_MS, keep: int = SLOW_TICK_KEEP):
+        self.sampler = sampler
+        self.budget = budget_ms / 1000.0
+        self.ticks = deque(maxlen=keep)
+        self._next_id = 1
+
+    def __call__(self, clock, engine):
+        if clock.total < self.budget:
+            return
+        per_personality = Counter()
+        for personality, seconds in clock.strategies:
+            per_personality[personality] += seconds
+        self.ticks.append({
+            "id": self._next_id,
+            "time": time.time(),
+            "duration_ms": round(clock.total * 1000, 3),
+            "round": getattr(engine, "round", None),
+            "sub_tick": getattr(engine, "sub_tick", None),
+            "phases_ms": {k: round(v * 1000, 3) for k, v in clock.phases.items()},
+            "strategies_ms": {k: round(v * 1000, 3) for k, v in per_personality.items()},
+            "stacks": self.sampler.window(clock.thread_id, clock.start, clock.last),
+        })
+        self._next_id += 1
+
+    def summary(self) -> list:
+        return [{k: v for k, v in t.items() if k != "stacks"} | {"samples": sum(t["stacks"].values())}
+                for t in self.ticks]
+
+    def folded(self, tick_id: int):
+        for t in self.ticks:
+            if t["id"] == tick_id:
+                return folded(t["stacks"])
+        return None
+
+
+sampler = SamplingProfiler()
+slow_ticks = SlowTickRecorder(sampler)
+
+
+def enable():
+    """Start sampling and slow-tick capture for this process."""
+    sampler.start()
+    if slow_ticks not in metrics.clock_listeners:
+        metrics.clock_listeners.append(slow_ticks)
+
+
+def disable():
+    sampler.stop()
+    if slow_ticks in metrics.clock_listeners:
+        metrics.clock_listeners.remove(slow_ticks)
+
+
+_snapshot = None                # previous allocations() snapshot, for diff
+_snapshot_lock = threading.Lock()
+
+
+def allocations(top: int = 25, group: str = "lineno", diff: bool = False) -> dict:
+    """tracemalloc top-N by `group` (lineno, filename or traceback).
+
+    Tracing starts on the first call, which therefore reports nothing yet.
+    With diff, sites are ranked by growth since the previous call.
+    """
+    global _snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        return {"tracing": "started", "top": []}
+    with _snapshot_lock:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        previous, _snapshot = _snapshot, snapshot
+    current, peak = tracemalloc.get_traced_memory()
+    if diff and previous is not None:
+        stats = snapshot.compare_to(previous, group)[:top]
+        rows = [{"site": _site(st.traceback, group), "size": st.size, "size_diff": st.size_diff,
+                 "count": st.count, "count_diff": st.count_diff} for st in stats]
+    else:
+        rows = [{"site": _site(st.traceback, group), "size": st.size, "count": st.count}
+                for st in snapshot.statistics(group)[:top]]
+    return {"tracing": "on", "traced_bytes": current, "peak_bytes": peak, "group": group,
+            "diff": bool(diff and previous is not None), "top": rows}
+
+
+def _site(traceback, group: str):
+    if group == "traceback":
+        return [f"{os.path.basename(f.filename)}:{f.lineno}" for f in traceback]
+    frame = traceback[0]
+    return frame.filename if group == "filename" else f"{frame.filename}:{frame.lineno}"
+
+
+def stop_allocations():
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+    tracemalloc.stop()
@@ -0,0 +1,82 @@
+"""Heap-based market event scheduler.
+
+Events are scheduled on the absolute sub-tick clock with a start and an end
+tick. Both transitions sit in one min-heap ordered by (tick, kind, seq):
+ends before starts on the same tick (so a name can expire and restart),
+then insertion order, which keeps replays deterministic. Insert and expiry
+are O(log n); nothing is scanned or decremented per tick.
+"""
+
+import heapq
+from dataclasses import dataclass
+
+_END, _START = 0, 1
+
+
+@dataclass(slots=True)
+class ScheduledEvent:
+    event: object
+    start: int
+    end: int
+    then: dict | None = None    # follow-up template, scheduled when this one ends
+    seq: int = 0
+
+
+class EventScheduler:
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self.active: dict[str, ScheduledEvent] = {}    # name -> entry, in start order
+        self.pending: dict[str, int] = {}               # name -> count of scheduled, not yet started
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, event, start: int, end: int, then: dict | None = None) -> ScheduledEvent:
+        """Queue `event` to be active for ticks start <= t < end."""
+        self._seq += 1
+        entry = ScheduledEvent(event, start, max(end, start + 1), then, self._seq)
+        heapq.heappush(self._heap, (start, _START, self._seq, entry))
+        self.pending[event.name] = self.pending.get(event.name, 0) + 1
+        return entry
+
+    def is_live(self, name: str, now: int) -> bool:
+        """Queued to start, or active past `now` (an event ending at `now` is not live)."""
+        entry = self.active.get(name)
+        return name in self.pending or (entry is not None and entry.end > now)
+
+    def advance(self, now: int):
+        """Apply every transition due at or before `now`; returns (started, ended) entries."""
+        started, ended = [], []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, kind, _, entry = heapq.heappop(heap)
+            name = entry.event.name
+            if kind == _START:
+                left = self.pending[name] - 1
+                if left:
+                    self.pending[name] = left
+                else:
+                    del self.pending[name]
+                current = self.active.get(name)
+                if current is not None:
+                    # Same name already running: the newer instance replaces it
+                    ended.append(self.active.pop(name))
+                self.active[name] = entry
+                heapq.heappush(heap, (entry.end, _END, entry.seq, entry))
+                started.append(entry)
+            elif self.active.get(name) is entry:
+                del self.active[name]
+                ended.append(entry)
+        return started, ended
+
+    def entries(self):
+        """Active entries, then pending ones in start order."""
+        yield from self.active.values()
+        for _, kind, _, entry in sorted(self._heap):
+            if kind == _START:
+                yield entry
+
+    def remaining(self, name: str, now: int) -> int:
+        entry = self.active.get(name)
+        return entry.end - now if entry else 0
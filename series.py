@@ -0,0 +1,93 @@
+"""Chart-resolution helpers: LTTB line downsampling, OHLC candle merging, history compaction."""
+
+import math
+from array import array
+
+
+def lttb(values, threshold: int, xs=None):
+    """Largest-Triangle-Three-Buckets over y-values at x = xs, or x = index when xs is None.
+
+    Returns (indices, values) of at most `threshold` points, always keeping the
+    first and last sample. Short series come back unchanged.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n)), list(values)
+
+    every = (n - 2) / (threshold - 2)
+    picked = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        if xs is None:
+            avg_x = (nxt_start + nxt_end - 1) / 2
+        else:
+            avg_x = sum(xs[nxt_start:nxt_end]) / (nxt_end - nxt_start)
+        avg_y = sum(values[nxt_start:nxt_end]) / (nxt_end - nxt_start)
+
+        ax, ay = (a if xs is None else xs[a]), values[a]
+        best_area = -1.0
+        best = start = int(i * every) + 1
+        for j in range(start, int((i + 1) * every) + 1):
+            x = j if xs is None else xs[j]
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area, best = area, j
+        picked.append(best)
+        a = best
+    picked.append(n - 1)
+    return picked, [values[i] for i in picked]
+
+
+def merge_candles(candles: list, width: int):
+    """Merge adjacent [open, high, low, close] candles so at most `width` remain.
+
+    Returns (candles, candles_per_bucket).
+    """
+    n = len(candles)
+    if width <= 0 or n <= width:
+        return [list(c) for c in candles], 1
+    size = math.ceil(n / width)
+    merged = []
+    for start in range(0, n, size):
+        chunk = candles[start:start + size]
+        merged.append([chunk[0][0], max(c[1] for c in chunk), min(c[2] for c in chunk), chunk[-1][3]])
+    return merged, size
+
+
+# A compacted series keeps its old head LTTB-downsampled in place. `index`
+# lists the original positions of those head entries (empty until the first
+# compaction); entries after the head are exact and shifted by a constant.
+
+def original_index(index: array, i: int) -> int:
+    """Position in the uncompacted series of entry i."""
+    m = len(index)
+    if i < m:
+        return index[i]
+    return i + (index[-1] + 1 - m if m else 0)
+
+
+def original_positions(index: array, n: int):
+    """Original positions of the first n entries, or None when never compacted (x = index)."""
+    return [original_index(index, i) for i in range(n)] if index else None
+
+
+def original_length(values, index: array) -> int:
+    return original_index(index, len(values) - 1) + 1 if len(values) else 0
+
+
+def compact(values: array, index: array, keep: int, points: int) -> int:
+    """Downsample all but the last `keep` entries of `values` to `points`, in place.
+
+    Updates `index` to match; returns the number of entries freed.
+    """
+    cut = len(values) - keep
+    if cut <= points:
+        return 0
+    # A head compacted before is unevenly spaced: pick by original position
+    picked, ys = lttb(values[:cut], points, original_positions(index, cut))
+    index[:] = array(index.typecode, (original_index(index, i) for i in picked))
+    values[:cut] = array(values.typecode, ys)
+    return cut - len(ys)
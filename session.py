@@ -0,0 +1,195 @@
+"""Game sessions: one engine, its lock, and the responses built for its current tick.
+
+Every engine mutation happens under the session lock. Tick requests are
+coalesced: a game advances at most once per TICK_WINDOW_SECONDS, and a
+request that carries a tick id the game has already reached does not advance
+it at all, so retries and extra viewers share one advance instead of speeding
+the game up. Responses are encoded once per (tick, variant) and the same
+bytes go to every request that asks for that variant until the next advance,
+along with their gzip form and an ETag, so spectators reading /api/state
+between ticks cost a dictionary lookup.
+
+Memory is budgeted at two levels: at each round boundary a game over
+ENGINE_MEMORY_BUDGET compacts its old history, and the registry evicts games
+idle for SESSION_IDLE_SECONDS, then least recently read ones while the total
+is over MEMORY_BUDGET. The game the UI is playing is never evicted.
+"""
+
+import gzip
+import json
+import threading
+import time
+import zlib
+
+from config import (TICK_WINDOW_SECONDS, STATE_GZIP_LEVEL, ENGINE_MEMORY_BUDGET, MEMORY_BUDGET,
+                    SESSION_IDLE_SECONDS, MEMORY_CHECK_SECONDS)
+from odds import WinOdds
+import metrics
+
+
+def encode(state: dict) -> bytes:
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+class GameSession:
+    def __init__(self, engine, store=None):
+        self.engine = engine
+        self.store = store
+        self.odds = WinOdds(engine)
+        self.lock = threading.Lock()
+        self.advanced_at = float("-inf")   # monotonic time of the last advance
+        self.responses = {}                # (variant, encoding) -> (body, etag) for engine.ticks
+        self.last_access = time.monotonic()
+
+    @property
+    def game_id(self) -> str:
+        return self.engine.game_id
+
+    def due(self, tick_id: int | None = None, window: float = TICK_WINDOW_SECONDS, now: float | None = None) -> bool:
+        """Whether tick() would advance now. Lock-free, so admission can ask before queueing."""
+        engine = self.engine
+        return (not engine.game_over
+                and (tick_id is None or engine.ticks < tick_id)
+                and (now or time.monotonic()) - self.advanced_at >= window)
+
+    def tick(self, assets=None, width=None, tick_id: int | None = None, window: float = TICK_WINDOW_SECONDS,
+             advance: bool = True):
+        """Advance unless coalesced (or advance=False); returns (encoded state, advanced)."""
+        variant = (tuple(assets) if assets is not None else None, width)
+        with self.lock:
+            now = time.monotonic()
+            self.last_access = now
+            engine = self.engine
+            if not (advance and self.due(tick_id, window, now)):
+                metrics.inc("tick_coalesced_total")
+                return self._entry(variant)[0], False
+
+            self._fit_budget()
+            state = engine.tick(assets=assets, width=width)
+            self.advanced_at = now
+            self.responses = {}
+            self.odds.update()
+            if self.store:
+                self.store.record_tick(engine)
+            return self._entry(variant, state=state)[0], True
+
+    def advance(self, ticks: int, assets=None, width=None, tick_id: int | None = None):
+        """Fast-forward up to `ticks` sub-ticks (never past tick_id); returns (encoded state, summary)."""
+        variant = (tuple(assets) if assets is not None else None, width)
+        with self.lock:
+            self.last_access = time.monotonic()
+            engine = self.engine
+            if tick_id is not None:
+                ticks = min(ticks, tick_id - engine.ticks)
+            self._fit_budget()
+            on_step = self.store.record_tick if self.store else None
+            summary = engine.advance(max(0, ticks), on_step=on_step)
+            if summary["ticks"]:
+                self.advanced_at = time.monotonic()
+                self.responses = {}
+                self.odds.update()
+            summary["game_over"] = engine.game_over
+            return self._entry(variant)[0], summary
+
+    def state(self, assets=None, width=None, encoding: str | None = None):
+        """Latest state without advancing; returns (body, etag). encoding is None or "gzip"."""
+        key = (tuple(assets) if assets is not None else None, width)
+        entry = self.responses.get((key, encoding))
+        if entry is None:
+            with self.lock:
+                entry = self._entry(key, encoding)
+        self.last_access = time.monotonic()
+        return entry
+
+    def _entry(self, variant, encoding=None, state=None):
+        """Cached (body, etag) for this tick, built on first use. Call with the lock held."""
+        entry = self.responses.get((variant, encoding))
+        if entry is None:
+            if encoding == "gzip":
+                body = gzip.compress(self._entry(variant)[0], STATE_GZIP_LEVEL, mtime=0)
+            else:
+                if state is None:
+                    state = self.engine.get_state(*variant)
+                body = encode(state)
+            etag = f"{self.game_id}.{self.engine.ticks}.{zlib.crc32(repr(variant).encode()):08x}"
+            if encoding:
+                etag += "." + encoding
+            entry = self.responses[(variant, encoding)] = (body, etag)
+        return entry
+
+    def _fit_budget(self):
+        """Compact history once per round if the game is over its budget. Call with the lock held."""
+        engine = self.engine
+        if engine.sub_tick == 0 and engine.memory_bytes() > ENGINE_MEMORY_BUDGET:
+            freed = engine.compact()
+            if freed:
+                metrics.inc("history_compacted_total", freed)
+
+    def close(self):
+        self.odds.cancel()
+
+
+class SessionRegistry:
+    """Live sessions by game id; `current` is the game the web UI plays."""
+
+    def __init__(self, store=None):
+        self.store = store
+        self.sessions: dict[str, GameSession] = {}
+        self.current: GameSession | None = None
+        self._lock = threading.Lock()
+        self._checked_at = time.monotonic()
+
+    def start(self, engine) -> GameSession:
+        """Register a new game and make it current."""
+        session = GameSession(engine, self.store)
+        with self._lock:
+            self.sessions[session.game_id] = session
+            self.current = session
+        return session
+
+    def get(self, game_id: str | None = None) -> GameSession | None:
+        """The named session, or the current one when game_id is None."""
+        if game_id is None:
+            return self.current
+        return self.sessions.get(game_id)
+
+    def drop(self, game_id: str):
+        with self._lock:
+            session = self.sessions.pop(game_id, None)
+            if session is self.current:
+                self.current = None
+        if session:
+            session.close()
+
+    def enforce(self, force: bool = False) -> list:
+        """Evict idle games, then the least recently read until the total fits; returns evicted ids.
+
+        Runs at most once per MEMORY_CHECK_SECONDS unless forced.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < MEMORY_CHECK_SECONDS:
+            return []
+        self._checked_at = now
+        with self._lock:
+            others = sorted((s for s in self.sessions.values() if s is not self.current),
+                            key=lambda s: s.last_access)
+        evicted = {s.game_id: "idle" for s in others if now - s.last_access >= SESSION_IDLE_SECONDS}
+        total = sum(s.engine.memory_bytes() for s in list(self.sessions.values()) if s.game_id not in evicted)
+        for session in others:
+            if total <= MEMORY_BUDGET:
+                break
+            if session.game_id in evicted:
+                continue
+            evicted.setdefault(session.game_id, "memory")
+            total -= session.engine.memory_bytes()
+        for game_id, reason in evicted.items():
+            self.drop(game_id)
+            metrics.inc("games_evicted_total", reason=reason)
+        return list(evicted)
+
+    def memory(self) -> list:
+        """Per-game memory estimate, most recently read first."""
+        now = time.monotonic()
+        return [{"game_id": s.game_id, "bytes": s.engine.memory_bytes(), "compactions": s.engine.compactions,
+                 "idle_seconds": round(now - s.last_access, 1), "current": s is self.current}
+                for s in sorted(self.sessions.values(), key=lambda s: s.last_access, reverse=True)]
@@ -8,6 +8,10 @@ let charts = {};
 let previousPrices = {};
 let botIconMap = {};
 
+/* Chart cards are a few hundred px wide; the server LTTB-downsamples history to this */
+const CHART_POINTS = 400;
+const TICK_URL = `/api/tick?width=${CHART_POINTS}`;
+
 /* ─── ICON SYSTEM ────────────────────────────────────────── */
 
 const BOT_ICONS = {
@@ -90,7 +94,7 @@ async function startGame() {
     try {
         await fetch("/api/new_game", { method: "POST" });
 
-        const resp = await fetch("/api/tick", { method: "POST" });
+        const resp = await fetch(TICK_URL, { method: "POST" });
         if (!resp.ok) return;
         gameState = await resp.json();
         if (!gameState || gameState.error) return;
@@ -114,7 +118,8 @@ function startTicking() {
 
 async function doTick() {
     try {
-        const resp = await fetch("/api/tick", { method: "POST" });
+        // Ask for the next tick by id so a retried or duplicated request can't advance twice
+        const resp = await fetch(`${TICK_URL}&tick_id=${gameState.tick + 1}`, { method: "POST" });
         if (!resp.ok) return;
         gameState = await resp.json();
         if (!gameState || gameState.error) return;
@@ -233,7 +238,7 @@ function initCharts(state) {
         const chartInstance = new Chart(ctx, {
             type: "line",
             data: {
-                labels: asset.history.map((_, i) => i),
+                labels: asset.history_x || asset.history.map((_, i) => i),
                 datasets: [{
                     data: asset.history,
                     borderColor: lineColor,
@@ -326,7 +331,7 @@ function updateCharts(state) {
 
         // Dynamic green/red line based on session trend
         const lineColor = getChartLineColor(history);
-        chart.data.labels = history.map((_, i) => i);
+        chart.data.labels = asset.history_x || history.map((_, i) => i);
         chart.data.datasets[0].data = history;
         chart.data.datasets[0].borderColor = lineColor;
         chart.data.datasets[0].pointHoverBackgroundColor = lineColor;
@@ -423,9 +428,12 @@ function updateLeaderboard(state) {
     const minNW = Math.min(...state.bots.map(b => b.net_worth));
     const range = maxNW - minNW || 1;
 
+    const odds = state.win_odds ? state.win_odds.bots : null;
+
     state.bots.forEach((bot, i) => {
         const row = document.createElement("div");
         row.className = "lb-row";
+        const winPct = odds ? Math.round(((odds[bot.name] || {}).win || 0) * 100) : null;
         const pnlClass = bot.pnl >= 0 ? "price-up" : "price-down";
         const barPct = Math.max(5, ((bot.net_worth - minNW) / range) * 100);
         const barClass = bot.pnl >= 0 ? "" : "negative";
@@ -435,6 +443,7 @@ function updateLeaderboard(state) {
             <span class="lb-rank">${rankIcon}</span>
             <span class="lb-icon">${botAvatar(bot.personality, 'avatar-lb')}</span>
             <span class="lb-name" style="color:#ffffff">${bot.name}</span>
+            ${winPct !== null ? `<span class="lb-odds" title="chance to win, from simulated playouts">${winPct}%</span>` : ""}
             <span class="lb-nw">$${formatNum(bot.net_worth)}</span>
             <span class="lb-pnl ${pnlClass}">${bot.pnl >= 0 ? "+" : ""}$${formatNum(bot.pnl)}</span>
             <div class="lb-bar-wrap"><div class="lb-bar ${barClass}" style="width:${barPct}%"></div></div>
@@ -528,6 +537,8 @@ function showFinalResults(state) {
         ["Best Single Trade", `${botAvatar(botIconMap[aw.best_trade.name] || '', 'avatar-sm')} ${aw.best_trade.name} ($${formatNum(aw.best_trade.pnl)})`],
         ["Worst Single Trade", `${botAvatar(botIconMap[aw.worst_trade.name] || '', 'avatar-sm')} ${aw.worst_trade.name} ($${formatNum(aw.worst_trade.pnl)})`],
         ["Biggest Loser", `${botAvatar(botIconMap[aw.biggest_loser.name] || '', 'avatar-sm')} ${aw.biggest_loser.name} ($${formatNum(aw.biggest_loser.pnl)})`],
+        ["Best Risk-Adjusted", `${botAvatar(botIconMap[aw.best_risk_adjusted.name] || '', 'avatar-sm')} ${aw.best_risk_adjusted.name} (Sharpe ${aw.best_risk_adjusted.sharpe.toFixed(2)})`],
+        ["Deepest Drawdown", `${botAvatar(botIconMap[aw.deepest_drawdown.name] || '', 'avatar-sm')} ${aw.deepest_drawdown.name} (-${(aw.deepest_drawdown.max_drawdown * 100).toFixed(1)}%)`],
     ];
     awards.forEach(([label, value]) => {
         const row = document.createElement("div");
@@ -0,0 +1,253 @@
+"""SQLite results store for finished games.
+
+The database runs in WAL mode so readers never block the writer. Every write
+goes through a queue to one background thread that drains it in batches
+(executemany, one transaction per flush), so callers only build rows and
+enqueue them. Per-round net-worth snapshots and the trade ledger are opt-in
+(STORE_ROUNDS / STORE_LEDGER) since they are far larger than the results.
+
+The store never takes the game down: a database that cannot be opened (a
+read-only deploy) disables it, a failed flush drops that batch and the writer
+carries on, and when the writer falls behind by STORE_QUEUE_MAX batches new
+rows are dropped rather than queued without bound.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+
+from config import (STORE_PATH, STORE_ROUNDS, STORE_LEDGER, STORE_BATCH, STORE_FLUSH_SECONDS, STORE_QUEUE_MAX,
+                    STARTING_CASH)
+import metrics
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    rounds INTEGER NOT NULL,
+    win_reason TEXT,
+    population INTEGER,
+    champion TEXT NOT NULL,
+    champion_personality TEXT NOT NULL,
+    champion_net_worth REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_finished ON games (finished_at);
+
+CREATE TABLE IF NOT EXISTS results (
+    game_id TEXT NOT NULL,
+    bot_name TEXT NOT NULL,
+    personality TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    net_worth REAL NOT NULL,
+    trades INTEGER NOT NULL,
+    taunts INTEGER NOT NULL,
+    sharpe REAL,
+    max_drawdown REAL,
+    PRIMARY KEY (game_id, bot_name)
+);
+CREATE INDEX IF NOT EXISTS results_bot ON results (bot_name, net_worth);
+CREATE INDEX IF NOT EXISTS results_personality ON results (personality, rank);
+
+CREATE TABLE IF NOT EXISTS awards (
+    game_id TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    award TEXT NOT NULL,
+    bot_name TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    PRIMARY KEY (game_id, award)
+);
+CREATE INDEX IF NOT EXISTS awards_by_name ON awards (award, finished_at);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    game_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    bot_name TEXT NOT NULL,
+    net_worth REAL NOT NULL,
+    PRIMARY KEY (game_id, round, bot_name)
+);
+
+CREATE TABLE IF NOT EXISTS ledger (
+    game_id TEXT NOT NULL,
+    tick INTEGER NOT NULL,
+    bot_name TEXT NOT NULL,
+    action TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ledger_game ON ledger (game_id, tick);
+"""
+
+INSERTS = {
+    "games": "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "results": "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "awards": "INSERT OR REPLACE INTO awards VALUES (?, ?, ?, ?, ?)",
+    "rounds": "INSERT OR REPLACE INTO rounds VALUES (?, ?, ?, ?)",
+    "ledger": "INSERT INTO ledger VALUES (?, ?, ?, ?, ?, ?, ?)",
+}
+# Parents first so a flush never holds results for a game row it has not written
+TABLE_ORDER = ("games", "results", "awards", "rounds", "ledger")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ResultsStore:
+    def __init__(self, path: str = STORE_PATH, rounds: bool = STORE_ROUNDS, ledger: bool = STORE_LEDGER,
+                 batch: int = STORE_BATCH, flush_seconds: float = STORE_FLUSH_SECONDS):
+        self.path = path
+        self.rounds = rounds
+        self.ledger = ledger
+        self.batch = batch
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue(STORE_QUEUE_MAX)
+        # Engines whose result is already queued, so repeated end-of-game ticks write once;
+        # weak, so a game leaves the set when it is dropped
+        self._finished = weakref.WeakSet()
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+
+    # ─── writes (request path: build rows, enqueue) ───────────
+    def record_tick(self, engine):
+        """Queue whatever this sub-tick produced: ledger rows, a round snapshot, the final result."""
+        if engine in self._finished:
+            return
+        gid = engine.game_id
+        if self.ledger and engine.round_actions:
+            tick = engine.ticks
+            self._put("ledger", [(gid, tick, a.bot_name, a.action, a.asset, a.amount, a.price)
+                                 for a in engine.round_actions if a.action in ("BUY", "SELL")])
+        if self.rounds and engine.sub_tick == 0 and engine.round:
+            self._put("rounds", [(gid, engine.round, b.name, b.net_worth()) for b in engine.bots])
+        if engine.game_over:
+            self._finished.add(engine)
+            self.record_game(engine)
+
+    def record_game(self, engine):
+        gid = engine.game_id
+        now = time.time()
+        ranked = sorted(((b.net_worth(), b) for b in engine.bots), key=lambda t: t[0], reverse=True)
+        champ_nw, champ = ranked[0]
+        self._put("games", [(gid, now, engine.round, engine.win_reason, engine.population,
+                             champ.name, champ.personality.value, champ_nw)])
+        self._put("results", [(gid, b.name, b.personality.value, i + 1, nw, b.trades_made, b.taunts_given,
+                               b.risk.sharpe, b.risk.max_drawdown) for i, (nw, b) in enumerate(ranked)])
+        awards = engine.get_state(assets=())["awards"] or {}
+        self._put("awards", [(gid, now, key, aw["name"], json.dumps({k: v for k, v in aw.items() if k != "name"}))
+                             for key, aw in awards.items()])
+
+    def _put(self, table: str, rows: list):
+        if rows:
+            try:
+                self._queue.put_nowait((table, rows))
+            except queue.Full:
+                metrics.inc("store_rows_dropped_total", len(rows), reason="queue_full")
+
+    # ─── writer thread ────────────────────────────────────────
+    def _run(self):
+        conn = connect(self.path)
+        pending = {t: [] for t in TABLE_ORDER}
+        count = 0
+        deadline = None
+        stop = False
+        while not stop:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                stop = True
+            elif item:
+                table, rows = item
+                pending[table].extend(rows)
+                count += len(rows)
+                deadline = deadline or time.monotonic() + self.flush_seconds
+                if count < self.batch:
+                    continue
+            if count:
+                try:
+                    with conn:
+                        for table in TABLE_ORDER:
+                            if pending[table]:
+                                conn.executemany(INSERTS[table], pending[table])
+                except sqlite3.Error as e:
+                    # Locked or full database: lose this batch, keep the writer alive
+                    log.warning("results store: dropped %d rows: %s", count, e)
+                    metrics.inc("store_rows_dropped_total", count, reason="write_error")
+                for table in TABLE_ORDER:
+                    pending[table] = []
+                count = 0
+            deadline = None
+        conn.close()
+
+    def close(self):
+        """Drain everything queued so far, then stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # ─── queries ──────────────────────────────────────────────
+    def _query(self, sql: str, args=()) -> list:
+        conn = connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(r) for r in conn.execute(sql, args)]
+        finally:
+            conn.close()
+
+    def leaderboard(self, limit: int = 25) -> list:
+        """All-time bots by average net worth, with wins and games played."""
+        return self._query("""
+            SELECT bot_name, personality, COUNT(*) AS games, SUM(rank = 1) AS wins,
+                   AVG(net_worth) AS avg_net_worth, MAX(net_worth) AS best_net_worth,
+                   AVG(sharpe) AS avg_sharpe
+            FROM results GROUP BY bot_name
+            ORDER BY avg_net_worth DESC LIMIT ?""", (limit,))
+
+    def personality_win_rates(self) -> list:
+        return self._query("""
+            SELECT personality, COUNT(DISTINCT game_id) AS games, SUM(rank = 1) AS wins,
+                   CAST(SUM(rank = 1) AS REAL) / COUNT(DISTINCT game_id) AS win_rate,
+                   AVG(net_worth) - ? AS avg_pnl
+            FROM results GROUP BY personality ORDER BY win_rate DESC""", (STARTING_CASH,))
+
+    def award_history(self, award: str | None = None, limit: int = 50) -> list:
+        sql = "SELECT game_id, finished_at, award, bot_name, detail FROM awards"
+        args = ()
+        if award:
+            sql += " WHERE award = ?"
+            args = (award,)
+        rows = self._query(sql + " ORDER BY finished_at DESC LIMIT ?", args + (limit,))
+        for row in rows:
+            row["detail"] = json.loads(row["detail"])
+        return rows
+
+
+_store = None
+
+
+def get_store():
+    """The process-wide store, or None when STORE_PATH is empty or cannot be opened."""
+    global _store
+    if _store is None and STORE_PATH:
+        try:
+            _store = ResultsStore(STORE_PATH)
+        except sqlite3.Error as e:
+            log.warning("results store disabled, cannot open %s: %s", STORE_PATH, e)
+            return None
+        atexit.register(_store.close)
+    return _store
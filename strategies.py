@@ -1,26 +1,27 @@
-"""Bot trading strategies — one function per personality."""
+"""Bot trading strategies — one function per personality.
+
+Thresholds, chances and sizes come from bot.params (BOT_PROFILES values unless
+overridden), so sweeps and population bots can tune them. Positions are read
+with bot.holding(asset); bot.held lists the assets a bot owns.
+Commentary is a template id from the config.COMMENTARY catalog plus its
+arguments, rendered only when shown (see commentary.py).
+"""
 
 import random
-from models import TradeAction, BotPersonality
+from commentary import pick
+from models import BotPersonality, new_action
+
 
+def decide(bot, assets, round_num, all_bots, events_by_target):
+    """Dispatch to the correct strategy based on bot personality.
 
-def decide(bot, assets, round_num, all_bots, active_events):
-    """Dispatch to the correct strategy based on bot personality."""
-    dispatch = {
-        BotPersonality.AGGRESSIVE: strategy_aggressive,
-        BotPersonality.CAUTIOUS: strategy_cautious,
-        BotPersonality.MOMENTUM: strategy_momentum,
-        BotPersonality.CONTRARIAN: strategy_contrarian,
-        BotPersonality.DEGEN: strategy_degen,
-        BotPersonality.SNIPER: strategy_sniper,
-        BotPersonality.WHALE: strategy_whale,
-        BotPersonality.SCALPER: strategy_scalper,
-        BotPersonality.DIAMOND_HANDS: strategy_diamond_hands,
-    }
-    fn = dispatch[bot.personality]
-    if bot.personality == BotPersonality.SNIPER:
-        actions = fn(bot, assets, round_num, active_events)
-    elif bot.personality == BotPersonality.WHALE:
+    events_by_target maps a target symbol (or "ALL") to its active events.
+    """
+    personality = bot.personality
+    fn = STRATEGIES[personality]
+    if personality is BotPersonality.SNIPER:
+        actions = fn(bot, assets, round_num, events_by_target)
+    elif personality is BotPersonality.WHALE:
         actions = fn(bot, assets, round_num, all_bots)
     else:
         actions = fn(bot, assets, round_num)
@@ -31,261 +32,213 @@ def decide(bot, assets, round_num, all_bots, active_events):
     return actions
 
 
+def _buy_qty(bot, asset, assets, share: float = 1.0) -> int:
+    """Units for a buy of trade_size * share of cash, trimmed so the position
+    stays within risk_tolerance of net worth."""
+    p = bot.params
+    qty = int(bot.cash * p["trade_size"] * share / asset.price)
+    if qty > 0 and p["risk_tolerance"] < 1:
+        room = p["risk_tolerance"] * bot.net_worth() - bot.holding(asset) * asset.price
+        qty = min(qty, int(room / asset.price))
+    return qty
+
+
 def strategy_aggressive(bot, assets, rnd):
     actions = []
+    p = bot.params
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if asset.volatility > 0.5 and bot.cash > asset.price * 2:
-            qty = int((bot.cash * 0.4) / asset.price)
-            if qty > 0 and random.random() < 0.6:
-                actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                    random.choice([
-                        f"Going HARD on {sym}! Blood in the water!",
-                        f"Smells like money. Loading {sym}.",
-                        f"Weakness is opportunity. Buying {sym} NOW.",
-                    ])))
+        held = bot.holding(asset)
+        if asset.volatility > p["min_volatility"] and bot.cash > asset.price * 2:
+            qty = _buy_qty(bot, asset, assets)
+            if qty > 0 and random.random() < p["entry_chance"]:
+                actions.append(new_action(bot.name, "BUY", sym, qty, asset.price, pick("aggressive_buy"), (sym,)))
                 bot.execute_buy(asset, qty)
-        if held > 0 and asset.change_pct > 2:
+        if held > 0 and asset.change_pct > p["take_profit"]:
             sell_qty = max(1, held // 2)
-            actions.append(TradeAction(bot.name, "SELL", sym, sell_qty, asset.price,
-                f"Taking profits on {sym}. The weak hold, the strong sell."))
+            actions.append(new_action(bot.name, "SELL", sym, sell_qty, asset.price,
+                pick("aggressive_take_profit"), (sym,)))
             bot.execute_sell(asset, sell_qty)
-        elif held > 0 and asset.change_pct < -5:
-            actions.append(TradeAction(bot.name, "SELL", sym, held, asset.price,
-                f"Cutting losses on {sym}. No sentiment. Only survival."))
+        elif held > 0 and asset.change_pct < -p["stop_loss"]:
+            actions.append(new_action(bot.name, "SELL", sym, held, asset.price,
+                pick("aggressive_stop_loss"), (sym,)))
             bot.execute_sell(asset, held)
     return actions
 
 
 def strategy_cautious(bot, assets, rnd):
     actions = []
+    p = bot.params
     bnb = assets.get("BNB")
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if asset.volatility < 0.5 and bot.cash > asset.price * 3:
-            qty = int((bot.cash * 0.1) / asset.price)
-            if qty > 0 and random.random() < 0.5:
-                actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                    random.choice([
-                        f"Carefully adding {sym} to portfolio.",
-                        f"Diversifying into {sym}. Patience pays.",
-                        f"Small position in {sym}. Risk managed.",
-                    ])))
+        held = bot.holding(asset)
+        if asset.volatility < p["max_volatility"] and bot.cash > asset.price * 3:
+            qty = _buy_qty(bot, asset, assets)
+            if qty > 0 and random.random() < p["entry_chance"]:
+                actions.append(new_action(bot.name, "BUY", sym, qty, asset.price, pick("cautious_buy"), (sym,)))
                 bot.execute_buy(asset, qty)
-        if held > 0 and asset.change_pct > 3:
+        if held > 0 and asset.change_pct > p["take_profit"]:
             sell_qty = max(1, held // 3)
-            actions.append(TradeAction(bot.name, "SELL", sym, sell_qty, asset.price,
-                f"Trimming {sym}. Locking in gains responsibly."))
+            actions.append(new_action(bot.name, "SELL", sym, sell_qty, asset.price, pick("cautious_trim"), (sym,)))
             bot.execute_sell(asset, sell_qty)
     if bnb and bot.cash > bnb.price * 5:
-        qty = int((bot.cash * 0.15) / bnb.price)
-        if qty > 0 and random.random() < 0.4:
-            actions.append(TradeAction(bot.name, "BUY", "BNB", qty, bnb.price,
-                "BNB is the safe play. Always."))
+        qty = _buy_qty(bot, bnb, assets, share=1.5)
+        if qty > 0 and random.random() < p["bnb_chance"]:
+            actions.append(new_action(bot.name, "BUY", "BNB", qty, bnb.price, pick("cautious_bnb")))
             bot.execute_buy(bnb, qty)
     return actions
 
 
 def strategy_momentum(bot, assets, rnd):
     actions = []
+    lookback = bot.params["lookback"]
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if len(asset.history) >= 3:
-            recent = asset.history[-3:]
+        held = bot.holding(asset)
+        if len(asset.history) >= lookback:
+            recent = asset.history[-lookback:]
             trending_up = all(recent[i] < recent[i + 1] for i in range(len(recent) - 1))
             trending_down = all(recent[i] > recent[i + 1] for i in range(len(recent) - 1))
             if trending_up and bot.cash > asset.price * 2:
-                qty = int((bot.cash * 0.3) / asset.price)
+                qty = _buy_qty(bot, asset, assets)
                 if qty > 0:
-                    actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                        random.choice([
-                            f"{sym} is LAUNCHING! Hopping on the rocket!",
-                            f"Momentum confirmed on {sym}. LFG!",
-                            f"{sym} to the MOON! Trend is my friend!",
-                        ])))
+                    actions.append(new_action(bot.name, "BUY", sym, qty, asset.price,
+                        pick("momentum_buy"), (sym,)))
                     bot.execute_buy(asset, qty)
             elif trending_down and held > 0:
-                actions.append(TradeAction(bot.name, "SELL", sym, held, asset.price,
-                    f"Trend broken on {sym}. Ejecting!"))
+                actions.append(new_action(bot.name, "SELL", sym, held, asset.price, pick("momentum_exit"), (sym,)))
                 bot.execute_sell(asset, held)
     return actions
 
 
 def strategy_contrarian(bot, assets, rnd):
     actions = []
+    p = bot.params
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if asset.change_pct < -3 and bot.cash > asset.price * 2:
-            qty = int((bot.cash * 0.25) / asset.price)
+        held = bot.holding(asset)
+        if asset.change_pct < -p["entry_move"] and bot.cash > asset.price * 2:
+            qty = _buy_qty(bot, asset, assets)
             if qty > 0:
-                actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                    random.choice([
-                        f"Everyone's selling {sym}? I'm BUYING.",
-                        f"Blood in the streets on {sym}. Time to feast.",
-                        f"The herd is wrong about {sym}. Classic.",
-                    ])))
+                actions.append(new_action(bot.name, "BUY", sym, qty, asset.price, pick("contrarian_buy"), (sym,)))
                 bot.execute_buy(asset, qty)
-        elif asset.change_pct > 4 and held > 0:
-            actions.append(TradeAction(bot.name, "SELL", sym, held, asset.price,
-                f"Too much euphoria on {sym}. Selling into strength."))
+        elif asset.change_pct > p["take_profit"] and held > 0:
+            actions.append(new_action(bot.name, "SELL", sym, held, asset.price, pick("contrarian_sell"), (sym,)))
             bot.execute_sell(asset, held)
     return actions
 
 
 def strategy_degen(bot, assets, rnd):
     actions = []
+    p = bot.params
     sol = assets.get("SOL")
-    if sol and bot.cash > sol.price * 3 and random.random() < 0.7:
-        qty = int((bot.cash * 0.7) / sol.price)
+    if sol and bot.cash > sol.price * 3 and random.random() < p["entry_chance"]:
+        qty = _buy_qty(bot, sol, assets)
         if qty > 0:
-            actions.append(TradeAction(bot.name, "BUY", "SOL", qty, sol.price,
-                random.choice([
-                    "YOLO!!! SOL TO THE MOON!!!",
-                    "APE IN APE IN APE IN!!!",
-                    "Sir, this is a casino. ALL IN on SOL!",
-                    "DIAMOND HANDS BABY! BUYING MORE SOL!",
-                    "Solana ecosystem is cooking. I'm in.",
-                ])))
+            actions.append(new_action(bot.name, "BUY", "SOL", qty, sol.price, pick("degen_buy")))
             bot.execute_buy(sol, qty)
-    for sym in list(bot.holdings.keys()):
-        if random.random() < 0.3:
-            held = bot.holdings[sym]
-            asset = assets[sym]
-            actions.append(TradeAction(bot.name, "SELL", sym, held, asset.price,
-                random.choice([
-                    f"Paper handing {sym} for more SOL money!",
-                    f"Selling {sym} because I got bored.",
-                    f"Need cash for the next YOLO. Dumping {sym}.",
-                ])))
+    for asset in list(bot.held):
+        if random.random() < p["exit_chance"]:
+            sym = asset.symbol
+            held = bot.holding(asset)
+            actions.append(new_action(bot.name, "SELL", sym, held, asset.price, pick("degen_sell"), (sym,)))
             bot.execute_sell(asset, held)
     return actions
 
 
-def strategy_sniper(bot, assets, rnd, events):
+def strategy_sniper(bot, assets, rnd, events_by_target):
     actions = []
-    event_assets = set()
-    for ev in events:
-        if ev.target_asset != "ALL":
-            event_assets.add(ev.target_asset)
-    for sym in event_assets:
-        if sym not in assets:
+    for sym, relevant in events_by_target.items():
+        if sym == "ALL" or sym not in assets:
             continue
         asset = assets[sym]
-        held = bot.holdings.get(sym, 0)
-        relevant = [e for e in events if e.target_asset == sym]
+        held = bot.holding(asset)
         for ev in relevant:
             if ev.price_impact > 0 and bot.cash > asset.price:
-                qty = int((bot.cash * 0.5) / asset.price)
+                qty = _buy_qty(bot, asset, assets)
                 if qty > 0:
-                    actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                        f"Event detected: {ev.name}. Sniping {sym}."))
+                    actions.append(new_action(bot.name, "BUY", sym, qty, asset.price,
+                        pick("sniper_buy"), (ev.name, sym)))
                     bot.execute_buy(asset, qty)
             elif ev.price_impact < 0 and held > 0:
-                actions.append(TradeAction(bot.name, "SELL", sym, held, asset.price,
-                    f"Negative event on {sym}. Precision exit."))
+                actions.append(new_action(bot.name, "SELL", sym, held, asset.price, pick("sniper_exit"), (sym,)))
                 bot.execute_sell(asset, held)
     if not actions and rnd % 3 == 0:
-        actions.append(TradeAction(bot.name, "HOLD", "", 0, 0,
-            random.choice([
-                "Waiting... Patience is a weapon.",
-                "No signal. No trade. Discipline.",
-                "*scans the market through the scope*",
-            ])))
+        actions.append(new_action(bot.name, "HOLD", "", 0, 0, pick("sniper_hold")))
     return actions
 
 
 def strategy_whale(bot, assets, rnd, bots):
     actions = []
+    p = bot.params
     cheapest = min(assets.values(), key=lambda a: a.price / (a.history[0] if a.history else a.price))
     if bot.cash > cheapest.price * 5:
-        qty = int((bot.cash * 0.35) / cheapest.price)
-        if qty > 0 and random.random() < 0.5:
-            actions.append(TradeAction(bot.name, "BUY", cheapest.symbol, qty, cheapest.price,
-                random.choice([
-                    f"Accumulating {cheapest.symbol}. They don't see me coming.",
-                    f"Adding to my {cheapest.symbol} position. I own this market.",
-                    f"*splashes into {cheapest.symbol}* The ocean is mine.",
-                ])))
+        qty = _buy_qty(bot, cheapest, assets)
+        if qty > 0 and random.random() < p["entry_chance"]:
+            actions.append(new_action(bot.name, "BUY", cheapest.symbol, qty, cheapest.price,
+                pick("whale_buy"), (cheapest.symbol,)))
             bot.execute_buy(cheapest, qty)
-    for sym, qty in list(bot.holdings.items()):
-        asset = assets[sym]
-        if asset.change_pct > 3 and qty > 5:
+    for asset in list(bot.held):
+        sym, qty = asset.symbol, bot.holding(asset)
+        if asset.change_pct > p["take_profit"] and qty > 5:
             sell = qty // 2
-            actions.append(TradeAction(bot.name, "SELL", sym, sell, asset.price,
-                f"Redistributing {sym}. The market bends to my will."))
+            actions.append(new_action(bot.name, "SELL", sym, sell, asset.price, pick("whale_sell"), (sym,)))
             bot.execute_sell(asset, sell)
     return actions
 
 
 def strategy_scalper(bot, assets, rnd):
     actions = []
+    p = bot.params
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if asset.change_pct < -0.5 and bot.cash > asset.price:
-            qty = max(1, int((bot.cash * 0.15) / asset.price))
-            if random.random() < 0.7:
-                actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                    random.choice([
-                        f"Scalping {sym}. In and out, quick profit.",
-                        f"Tiny dip on {sym}. Free money.",
-                        f"Tick by tick. Buying {sym}.",
-                    ])))
+        held = bot.holding(asset)
+        if asset.change_pct < -p["entry_move"] and bot.cash > asset.price:
+            # Always at least one unit (it is affordable here), even past the risk cap
+            qty = max(1, _buy_qty(bot, asset, assets))
+            if random.random() < p["entry_chance"]:
+                actions.append(new_action(bot.name, "BUY", sym, qty, asset.price, pick("scalper_buy"), (sym,)))
                 bot.execute_buy(asset, qty)
-        if held > 0 and asset.change_pct > 0.5:
+        if held > 0 and asset.change_pct > p["take_profit"]:
             sell_qty = max(1, held // 2)
-            actions.append(TradeAction(bot.name, "SELL", sym, sell_qty, asset.price,
-                random.choice([
-                    f"Booking the tick on {sym}. Every cent counts.",
-                    f"Quick flip on {sym}. Next.",
-                    f"Scalped {sym}. Rinse and repeat.",
-                ])))
+            actions.append(new_action(bot.name, "SELL", sym, sell_qty, asset.price, pick("scalper_sell"), (sym,)))
             bot.execute_sell(asset, sell_qty)
     return actions
 
 
 def strategy_diamond_hands(bot, assets, rnd):
     actions = []
+    p = bot.params
     for sym, asset in assets.items():
-        held = bot.holdings.get(sym, 0)
-        if bot.cash > asset.price * 2 and random.random() < 0.4:
-            qty = int((bot.cash * 0.2) / asset.price)
+        held = bot.holding(asset)
+        if bot.cash > asset.price * 2 and random.random() < p["entry_chance"]:
+            qty = _buy_qty(bot, asset, assets)
             if qty > 0:
-                actions.append(TradeAction(bot.name, "BUY", sym, qty, asset.price,
-                    random.choice([
-                        f"Adding {sym} to the vault. Never selling.",
-                        f"Accumulating {sym}. Diamond hands don't waver.",
-                        f"HODL {sym}. Time in market > timing the market.",
-                    ])))
+                actions.append(new_action(bot.name, "BUY", sym, qty, asset.price, pick("diamond_buy"), (sym,)))
                 bot.execute_buy(asset, qty)
-        if held > 0 and asset.change_pct < -10:
+        if held > 0 and asset.change_pct < -p["stop_loss"]:
             sell_qty = max(1, held // 4)
-            actions.append(TradeAction(bot.name, "SELL", sym, sell_qty, asset.price,
-                f"Even diamond hands crack sometimes... trimming {sym}."))
+            actions.append(new_action(bot.name, "SELL", sym, sell_qty, asset.price, pick("diamond_trim"), (sym,)))
             bot.execute_sell(asset, sell_qty)
     if rnd % 2 == 0 and not actions:
-        actions.append(TradeAction(bot.name, "HOLD", "", 0, 0,
-            random.choice([
-                "HODL. It's not just a strategy, it's a lifestyle.",
-                "Still holding. Still winning.",
-                "Paper hands get paper gains. I want diamonds.",
-            ])))
+        actions.append(new_action(bot.name, "HOLD", "", 0, 0, pick("diamond_hold")))
     return actions
 
 
+STRATEGIES = {
+    BotPersonality.AGGRESSIVE: strategy_aggressive,
+    BotPersonality.CAUTIOUS: strategy_cautious,
+    BotPersonality.MOMENTUM: strategy_momentum,
+    BotPersonality.CONTRARIAN: strategy_contrarian,
+    BotPersonality.DEGEN: strategy_degen,
+    BotPersonality.SNIPER: strategy_sniper,
+    BotPersonality.WHALE: strategy_whale,
+    BotPersonality.SCALPER: strategy_scalper,
+    BotPersonality.DIAMOND_HANDS: strategy_diamond_hands,
+}
+
+
 def generate_taunt(bot, bots):
-    others = [b for b in bots if b != bot]
-    target = random.choice(others) if others else bot
-    taunts = [
-        f"Hey {target.name}, is that a portfolio or a dumpster fire?",
-        f"{target.name} trades like a goldfish with a credit card.",
-        f"My strategy is so advanced, {target.name}'s account just filed for bankruptcy.",
-        f"While {target.name} was sleeping, I was TRADING.",
-        f"Imagine losing money in THIS market. Couldn't be me. *looks at {target.name}*",
-        f"{target.name}, your strategy is basically 'buy high sell low' right?",
-        f"*{bot.name} flexes on {target.name}*",
-        f"GG EZ, {target.name}. GG EZ.",
-        f"I've seen better trades from a random number generator. Looking at you, {target.name}.",
-        f"Just checked the leaderboard. {target.name} is speed-running poverty.",
-    ]
+    # Redraw instead of copying the roster: O(1) even with thousands of bots
+    target = bot
+    if len(bots) > 1:
+        while target is bot:
+            target = random.choice(bots)
     bot.taunts_given += 1
-    return TradeAction(bot.name, "TAUNT", "", 0, 0, random.choice(taunts))
+    return new_action(bot.name, "TAUNT", "", 0, 0, pick("taunt"), (target.name, bot.name))
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Strategy parameter sweeps over seeded headless games.
+
+One personality's BOT_PROFILES parameters are varied while everything else
+plays stock. Each (parameters, seed) game runs on a process pool and its
+result is stored in a content-addressed cache keyed by the parameters, the
+seed and a hash of the simulation source, so re-running a sweep only plays
+the points it has not seen and any code change invalidates old results.
+
+    python sweep.py aggressive --param stop_loss=2,5,8 --param take_profit=1,2,4
+    python sweep.py scalper --mode random --param entry_move=0.1:2 --candidates 40
+    python sweep.py whale --mode halving --param trade_size=0.1:0.9 --param entry_chance=0.2:1
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from config import SWEEP_CACHE_DIR, SWEEP_SEEDS
+from engine import GameEngine
+from models import BUILTIN_PERSONALITIES, profile_params
+
+SOURCES = ("book.py", "commentary.py", "config.py", "engine.py", "models.py", "scheduler.py", "strategies.py", "universe.py")
+
+
+# ─── RESULT CACHE ────────────────────────────────────────────
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCES:
+        with open(os.path.join(here, name), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def cache_key(personality: str, params: dict, seed: int) -> str:
+    blob = json.dumps({"personality": personality, "params": params, "seed": seed, "code": code_version()},
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """One JSON file per key under root/ab/cdef...; writes are atomic renames."""
+
+    def __init__(self, root: str = SWEEP_CACHE_DIR):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:] + ".json")
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+# ─── EVALUATION ──────────────────────────────────────────────
+def play_one(task) -> dict:
+    """Play one seeded offline game; returns how `personality` finished."""
+    personality, params, seed = task
+    random.seed(seed)
+    engine = GameEngine(live_prices=False, params={personality: params})
+    engine.pool_actions = True
+    while not engine.game_over:
+        engine.step()
+    worths = sorted(((b.net_worth(), b) for b in engine.bots), key=lambda t: t[0], reverse=True)
+    rank = next(i for i, (_, b) in enumerate(worths) if b.personality.value == personality)
+    return {"net_worth": worths[rank][0], "rank": rank + 1, "won": rank == 0}
+
+
+def evaluate(personality: str, candidates: list, seeds: range, pool, cache: ResultCache):
+    """Score every candidate over `seeds`; returns [(score dict, params)] and the cache hit count."""
+    keys = {}
+    results = {}
+    for params in candidates:
+        for seed in seeds:
+            key = cache_key(personality, params, seed)
+            hit = cache.get(key)
+            if hit is None:
+                keys[key] = (personality, params, seed)
+            else:
+                results[key] = hit
+    hits = len(results)
+    todo = list(keys.items())
+    for (key, _), result in zip(todo, pool.map(play_one, [t for _, t in todo], chunksize=4)):
+        cache.put(key, result)
+        results[key] = result
+
+    scored = []
+    for params in candidates:
+        games = [results[cache_key(personality, params, seed)] for seed in seeds]
+        scored.append(({
+            "mean_net_worth": statistics.fmean(g["net_worth"] for g in games),
+            "win_rate": sum(g["won"] for g in games) / len(games),
+            "mean_rank": statistics.fmean(g["rank"] for g in games),
+            "games": len(games),
+        }, params))
+    scored.sort(key=lambda t: t[0]["mean_net_worth"], reverse=True)
+    return scored, hits
+
+
+# ─── SEARCH ──────────────────────────────────────────────────
+def parse_space(personality: str, specs: list) -> dict:
+    """--param name=a,b,c (choices) or name=lo:hi (range) -> {name: list | (lo, hi)}."""
+    defaults = profile_params(personality)
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in defaults:
+            raise SystemExit(f"{personality} has no parameter {name!r} (have: {', '.join(defaults)})")
+        cast = int if isinstance(defaults[name], int) else float
+        if ":" in values:
+            lo, hi = values.split(":")
+            space[name] = (cast(lo), cast(hi))
+        else:
+            space[name] = [cast(v) for v in values.split(",")]
+    return space
+
+
+def _sample(space: dict, rng: random.Random) -> dict:
+    out = {}
+    for name, dom in space.items():
+        if isinstance(dom, list):
+            out[name] = rng.choice(dom)
+        elif isinstance(dom[0], int):
+            out[name] = rng.randint(dom[0], dom[1])
+        else:
+            out[name] = round(rng.uniform(*dom), 4)
+    return out
+
+
+def grid(space: dict, steps: int) -> list:
+    axes = []
+    for name, dom in space.items():
+        if isinstance(dom, list):
+            axes.append([(name, v) for v in dom])
+        else:
+            lo, hi = dom
+            if steps > 1:
+                vals = [lo + (hi - lo) * i / (steps - 1) for i in range(steps)]
+            else:
+                vals = [(lo + hi) / 2]
+            if isinstance(lo, int):
+                vals = sorted(set(round(v) for v in vals))
+            axes.append([(name, round(v, 4)) for v in vals])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def sweep(personality: str, space: dict, mode: str = "grid", candidates: int = 27, seeds: int = SWEEP_SEEDS,
+          eta: int = 3, steps: int = 4, workers: int | None = None, cache: ResultCache | None = None,
+          rng_seed: int = 0, log=print):
+    """Run a sweep; returns the final [(score, params)] ranking, best first."""
+    cache = cache or ResultCache()
+    rng = random.Random(rng_seed)
+    if mode == "grid":
+        pool_of = grid(space, steps)
+    else:
+        pool_of = [_sample(space, rng) for _ in range(candidates)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if mode != "halving":
+            ranked, hits = evaluate(personality, pool_of, range(seeds), pool, cache)
+            log(f"  {len(pool_of)} candidates x {seeds} seeds ({hits} cached)")
+            return ranked
+
+        # Successive halving: every rung keeps the best 1/eta and gives them eta x the seeds
+        rung_seeds = max(1, seeds // eta ** 2)
+        while True:
+            ranked, hits = evaluate(personality, pool_of, range(rung_seeds), pool, cache)
+            log(f"  rung: {len(pool_of)} candidates x {rung_seeds} seeds ({hits} cached)")
+            if rung_seeds >= seeds:
+                return ranked
+            pool_of = [params for _, params in ranked[:max(1, len(pool_of) // eta)]]
+            rung_seeds = min(seeds, rung_seeds * eta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep one personality's strategy parameters")
+    parser.add_argument("personality", choices=sorted(p.value for p in BUILTIN_PERSONALITIES))
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=SPEC",
+                        help="a,b,c for choices or lo:hi for a range (repeatable)")
+    parser.add_argument("--mode", choices=("grid", "random", "halving"), default="grid")
+    parser.add_argument("--candidates", type=int, default=27, help="random/halving sample count (default: 27)")
+    parser.add_argument("--seeds", type=int, default=SWEEP_SEEDS, help=f"games per candidate (default: {SWEEP_SEEDS})")
+    parser.add_argument("--steps", type=int, default=4, help="grid points per lo:hi range (default: 4)")
+    parser.add_argument("--eta", type=int, default=3, help="halving keep-1-in-eta factor (default: 3)")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="rows to print (default: 10)")
+    args = parser.parse_args(argv)
+
+    if args.steps < 1:
+        parser.error("--steps must be at least 1")
+    space = parse_space(args.personality, args.param)
+    if not space:
+        parser.error("give at least one --param")
+    started = time.perf_counter()
+    ranked = sweep(args.personality, space, args.mode, args.candidates, args.seeds, args.eta, args.steps, args.workers)
+    print(f"\n  {'NET WORTH':>11} {'WIN %':>6} {'RANK':>5} {'GAMES':>6}  PARAMS")
+    for score, params in ranked[:args.top]:
+        print(f"  ${score['mean_net_worth']:>10,.2f} {score['win_rate'] * 100:>5.1f}% {score['mean_rank']:>5.2f} "
+              f"{score['games']:>6}  {json.dumps(params)}")
+    print(f"\n  done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
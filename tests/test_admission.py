@@ -0,0 +1,102 @@
+import pytest
+
+import admission
+from admission import Admission, EngineSlots, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(admission.time, "monotonic", c)
+    return c
+
+
+def test_bucket_spends_burst_then_refills(clock):
+    limiter = RateLimiter(rate=2.0, burst=3)
+    assert [limiter.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.take("a") == pytest.approx(0.5)
+    assert limiter.take("b") == 0.0       # buckets are per key
+    clock.now += 0.5
+    assert limiter.take("a") == 0.0
+    clock.now += 100
+    assert [limiter.take("a") for _ in range(4)][-1] > 0   # refill caps at burst
+
+
+def test_bucket_lru_bound(clock):
+    limiter = RateLimiter(rate=1.0, burst=1, max_keys=2)
+    limiter.take("a")
+    limiter.take("b")
+    limiter.take("a")           # a is most recent; c pushes b out
+    limiter.take("c")
+    assert list(limiter._buckets) == ["a", "c"]
+    assert limiter.take("b") == 0.0     # a dropped key starts with a full bucket
+
+
+def test_slots_queue_full_and_timeout():
+    slots = EngineSlots(slots=1, queue=1, timeout=0.01)
+    assert slots.acquire() is None
+    assert slots.acquire() == "queue_timeout"
+    assert slots.in_flight == 1
+    slots._admitted = slots.capacity        # one running, one waiting
+    assert slots.acquire() == "queue_full"
+    slots._admitted = 1
+    slots.release()
+    assert slots.in_flight == 0 and slots.acquire() is None
+
+
+def make(monkeypatch, **overrides):
+    for name, value in {"CLIENT_RATE": 1.0, "CLIENT_BURST": 100, "GAME_RATE": 1.0, "GAME_BURST": 2,
+                        "ENGINE_SLOTS": 4, "ENGINE_QUEUE": 0, "ENGINE_QUEUE_TIMEOUT": 0.01}.items():
+        monkeypatch.setattr(admission, name, overrides.get(name, value))
+    return Admission(enabled=True)
+
+
+def test_disabled_admits_everything(monkeypatch):
+    a = make(monkeypatch, CLIENT_BURST=0)
+    a.enabled = False
+    assert a.check("c", "g") is None
+    a.release()
+
+
+def test_game_bucket_shared_across_clients(monkeypatch, clock):
+    a = make(monkeypatch)
+    assert a.check("c1", "g") is None
+    assert a.check("c2", "g") is None
+    assert a.check("c3", "g") == (429, "game_rate", 1)
+    assert a.check("c3", "other") is None
+    for _ in range(3):
+        a.release()
+
+
+def test_coalesced_requests_spend_only_client_tokens(monkeypatch, clock):
+    a = make(monkeypatch)
+    for _ in range(10):
+        assert a.check("viewer", "g", work=False) is None
+    assert a.slots.in_flight == 0
+    assert a.check("viewer", "g") is None
+    a.release()
+
+
+def test_client_bucket_checked_first(monkeypatch, clock):
+    a = make(monkeypatch, CLIENT_BURST=1)
+    assert a.check("c", None) is None
+    a.release()
+    assert a.check("c", None) == (429, "client_rate", 1)
+    assert a.check("c", None, work=False) == (429, "client_rate", 1)
+
+
+def test_new_game_skips_the_game_bucket(monkeypatch, clock):
+    a = make(monkeypatch, GAME_BURST=1)
+    for i in range(4):
+        assert a.check(f"c{i}", None) is None
+    assert a.check("c9", None) == (503, "queue_full", 1)     # bounded by engine slots instead
+    for _ in range(4):
+        a.release()
@@ -0,0 +1,83 @@
+import pytest
+
+from book import SCALE, Book, to_dollars, to_units
+from models import Asset, Bot, BotPersonality
+
+
+def make_asset(asset_id, price):
+    return Asset(f"A{asset_id}", f"Asset {asset_id}", price, 1.0, 0.0, id=asset_id)
+
+
+@pytest.fixture
+def game():
+    book = Book(n_bots=2, n_assets=2, cash=1000.0)
+    assets = [make_asset(0, 0.1), make_asset(1, 33.333333)]
+    book.quote(assets)
+    bots = [Bot(BotPersonality.CAUTIOUS, book, row=i) for i in range(2)]
+    return book, assets, bots
+
+
+def test_units_round_trip():
+    assert to_units(0.1) == 100_000
+    assert to_units(33.3333334) == 33_333_333
+    assert to_dollars(to_units(12.345678)) == 12.345678
+
+
+def test_quote_fixes_prices_in_units(game):
+    book, assets, _ = game
+    assert list(book.prices) == [100_000, 33_333_333]
+    assets[0].price = 0.2000004
+    book.quote(assets)
+    assert book.prices[0] == 200_000
+
+
+def test_buy_and_sell_settle_exactly(game):
+    book, (dime, third), (bot, other) = game
+    # 0.1 is not exact in binary; ten buys of 0.1 must still cost exactly 1.0
+    for _ in range(10):
+        assert bot.execute_buy(dime, 1)
+    assert book.cash[0] == 999 * SCALE and bot.cash == 999.0
+    assert bot.holding(dime) == 10 and bot.cost_basis(dime) == 0.1
+    assert bot.execute_sell(dime, 10)
+    assert book.cash[0] == 1000 * SCALE and book.cost[bot.base + dime.id] == 0
+    assert bot.held == [] and bot.positions() == {}
+    # Rows are independent
+    assert book.cash[1] == 1000 * SCALE and other.holding(dime) == 0
+
+
+def test_partial_sells_release_all_cost(game):
+    book, (_, third), (bot, _) = game
+    assert bot.execute_buy(third, 3)
+    paid = 3 * 33_333_333
+    k = bot.base + third.id
+    assert book.cost[k] == paid
+    for _ in range(3):
+        assert bot.execute_sell(third, 1)
+    # Floored pro-rata shares add back up to what was paid, to the unit
+    assert book.cost[k] == 0 and book.cash[0] == 1000 * SCALE
+    assert bot.execute_sell(third, 1) is False
+
+
+def test_buy_rejects_overspend(game):
+    book, (_, third), (bot, _) = game
+    assert not bot.execute_buy(third, 31)
+    assert not bot.execute_buy(third, 0)
+    assert book.cash[0] == 1000 * SCALE and bot.held == []
+
+
+def test_net_worths_match_per_bot(game):
+    book, (dime, third), (bot, other) = game
+    bot.execute_buy(dime, 7)
+    bot.execute_buy(third, 2)
+    other.execute_buy(third, 29)
+    third.price = 40.0
+    book.quote([dime, third])
+    worths = book.net_worths()
+    assert worths.dtype.kind == "i"
+    assert list(worths) == [round(b.net_worth() * SCALE) for b in (bot, other)]
+    assert worths[1] == 1000 * SCALE - 29 * 33_333_333 + 29 * 40 * SCALE
+
+
+def test_nbytes(game):
+    book, _, _ = game
+    assert book.nbytes() == 8 * (2 + 4 + 4 + 2)
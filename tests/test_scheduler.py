@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+from scheduler import EventScheduler
+
+
+def ev(name):
+    return SimpleNamespace(name=name)
+
+
+def names(entries):
+    return [e.event.name for e in entries]
+
+
+def test_starts_and_ends_on_their_ticks():
+    s = EventScheduler()
+    s.schedule(ev("crash"), 2, 5)
+    assert s.advance(1) == ([], [])
+    started, ended = s.advance(2)
+    assert names(started) == ["crash"] and ended == []
+    assert s.advance(4) == ([], [])
+    started, ended = s.advance(5)
+    assert started == [] and names(ended) == ["crash"]
+    assert s.active == {} and len(s) == 0
+
+
+def test_same_tick_starts_keep_insertion_order():
+    s = EventScheduler()
+    for name in ("c", "a", "b"):
+        s.schedule(ev(name), 3, 10)
+    started, _ = s.advance(3)
+    assert names(started) == ["c", "a", "b"]
+    assert list(s.active) == ["c", "a", "b"]
+
+
+def test_end_before_start_on_the_same_tick():
+    s = EventScheduler()
+    first = s.schedule(ev("pump"), 0, 4)
+    second = s.schedule(ev("pump"), 4, 8)
+    s.advance(0)
+    started, ended = s.advance(4)
+    assert ended == [first] and started == [second]
+    assert s.active["pump"] is second
+
+
+def test_newer_instance_replaces_a_running_one():
+    s = EventScheduler()
+    first = s.schedule(ev("hype"), 0, 10)
+    s.advance(0)
+    second = s.schedule(ev("hype"), 3, 6)
+    started, ended = s.advance(3)
+    assert started == [second] and ended == [first]
+    assert s.advance(6) == ([], [second])
+    # The replaced entry's own end comes later and must not be reported again
+    assert s.advance(10) == ([], [])
+    assert s.active == {}
+
+
+def test_catching_up_applies_every_due_transition():
+    s = EventScheduler()
+    s.schedule(ev("a"), 1, 2)
+    s.schedule(ev("b"), 2, 9)
+    started, ended = s.advance(5)
+    assert names(started) == ["a", "b"] and names(ended) == ["a"]
+    assert s.remaining("b", 5) == 4 and s.remaining("a", 5) == 0
+
+
+def test_is_live_and_entries():
+    s = EventScheduler()
+    s.schedule(ev("later"), 5, 7)
+    s.schedule(ev("now"), 0, 3)
+    s.advance(0)
+    assert s.is_live("later", 0) and s.is_live("now", 2)
+    assert not s.is_live("now", 3) and not s.is_live("other", 0)
+    assert names(s.entries()) == ["now", "later"]
+    s.advance(7)
+    assert not s.is_live("later", 7) and s.pending == {}
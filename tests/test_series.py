@@ -0,0 +1,95 @@
+import math
+from array import array
+
+from series import compact, lttb, merge_candles, original_index, original_length
+
+
+def test_lttb_short_series_unchanged():
+    assert lttb([3.0, 1.0, 2.0], 5) == ([0, 1, 2], [3.0, 1.0, 2.0])
+    assert lttb([3.0, 1.0, 2.0, 4.0], 2) == ([0, 1, 2, 3], [3.0, 1.0, 2.0, 4.0])
+
+
+def test_lttb_keeps_ends_and_threshold():
+    values = [math.sin(i / 10) for i in range(1000)]
+    xs, ys = lttb(values, 50)
+    assert len(xs) == 50
+    assert xs[0] == 0 and xs[-1] == 999
+    assert xs == sorted(set(xs))
+    assert ys == [values[i] for i in xs]
+
+
+def test_lttb_keeps_a_spike():
+    values = [0.0] * 500
+    values[123] = 10.0
+    xs, _ = lttb(values, 20)
+    assert 123 in xs
+
+
+def test_lttb_implicit_x_matches_explicit_index():
+    values = [math.cos(i / 7) * i for i in range(300)]
+    assert lttb(values, 40) == lttb(values, 40, list(range(300)))
+
+
+def test_lttb_uses_given_x_positions():
+    # At x = 0, 70, 80, 100 the point (70, 70) lies on the line between the ends
+    # and adds nothing; spaced by index it is the biggest outlier
+    values = [0.0, 70.0, 40.0, 100.0]
+    assert lttb(values, 3)[0] == [0, 1, 3]
+    assert lttb(values, 3, [0, 70, 80, 100])[0] == [0, 2, 3]
+
+
+def test_merge_candles():
+    candles = [[1, 2, 0.5, 1.5], [1.5, 3, 1, 2], [2, 2.5, 0.2, 1], [1, 1, 1, 1], [1, 4, 1, 3]]
+    merged, per_bucket = merge_candles(candles, 2)
+    assert per_bucket == 3
+    assert merged == [[1, 3, 0.2, 1], [1, 4, 1, 3]]
+    same, one = merge_candles(candles, 10)
+    assert same == candles and one == 1 and same[0] is not candles[0]
+
+
+def test_original_index_uncompacted_and_compacted():
+    assert original_index(array("q"), 7) == 7
+    index = array("q", [0, 40, 99])      # head of 3 standing for positions 0..99
+    assert [original_index(index, i) for i in range(5)] == [0, 40, 99, 100, 101]
+    assert original_length(array("d", [0.0] * 5), index) == 102
+
+
+def test_compact_keeps_tail_exact_and_positions():
+    values = array("d", (math.sin(i / 30) for i in range(2000)))
+    original = values[:]
+    index = array("q")
+    freed = compact(values, index, keep=500, points=100)
+    assert freed == 1400 and len(values) == 600 and len(index) == 100
+    assert values[100:] == original[1500:]
+    assert original_length(values, index) == 2000
+    assert [values[i] for i in range(100)] == [original[p] for p in index]
+
+
+def test_compact_leaves_short_series_alone():
+    values = array("d", range(50))
+    index = array("q")
+    assert compact(values, index, keep=20, points=40) == 0
+    assert len(values) == 50 and len(index) == 0
+
+
+def test_second_compaction_uses_original_positions():
+    # A head left by an earlier compaction, at original positions 0, 70, 80, 100
+    values = array("d", [0.0, 70.0, 40.0, 100.0, 1.0, 2.0])
+    index = array("q", [0, 70, 80, 100])
+    assert compact(values, index, keep=2, points=3) == 1
+    # Evenly spaced, the head would keep position 70; by position, 80 is the outlier
+    assert list(index) == [0, 80, 100]
+    assert list(values) == [0.0, 40.0, 100.0, 1.0, 2.0]
+    assert original_length(values, index) == 103
+
+
+def test_repeated_compaction_stays_ordered():
+    values = array("d", (math.sin(i / 50) for i in range(3000)))
+    values[1500] = 9.0
+    index = array("q")
+    compact(values, index, keep=1000, points=200)
+    values.extend(math.sin(i / 50) for i in range(3000, 6000))
+    compact(values, index, keep=1000, points=200)
+    assert list(index) == sorted(set(index))
+    assert original_length(values, index) == 6000
+    assert 1500 in index
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from engine import GameEngine
+from session import GameSession, SessionRegistry
+
+
+@pytest.fixture
+def session():
+    random.seed(7)
+    s = GameSession(GameEngine(live_prices=False))
+    yield s
+    s.close()
+
+
+def test_tick_id_already_reached_does_not_advance(session):
+    body, advanced = session.tick(tick_id=1, window=0)
+    assert advanced and session.engine.ticks == 1
+    # A retry of the same request gets the same bytes back
+    again, advanced = session.tick(tick_id=1, window=0)
+    assert not advanced and again == body and session.engine.ticks == 1
+    assert session.tick(tick_id=0, window=0)[1] is False
+    assert session.tick(tick_id=2, window=0)[1] is True
+    assert session.engine.ticks == 2
+
+
+def test_window_coalesces_concurrent_viewers(session):
+    first, advanced = session.tick(window=60)
+    assert advanced
+    results = [session.tick(window=60) for _ in range(20)]
+    assert all(not adv and body == first for body, adv in results)
+    assert session.engine.ticks == 1
+    assert not session.due(window=60)
+    assert session.due(window=0)
+
+
+def test_advance_false_only_reads(session):
+    body, advanced = session.tick(window=0, advance=False)
+    assert not advanced and session.engine.ticks == 0
+    assert body == session.tick(window=0, advance=False)[0]
+
+
+def test_advance_stops_at_tick_id(session):
+    _, summary = session.advance(50, tick_id=10)
+    assert summary["ticks"] == 10 and session.engine.ticks == 10
+    _, summary = session.advance(50, tick_id=10)
+    assert summary["ticks"] == 0 and session.engine.ticks == 10
+
+
+def test_state_is_cached_per_tick_and_variant(session):
+    body, etag = session.state()
+    assert session.state() == (body, etag)
+    gz, gz_etag = session.state(encoding="gzip")
+    assert gz_etag == etag + ".gzip"
+    _, narrow = session.state(width=20)
+    assert narrow != etag
+    session.tick(window=0)
+    assert session.state()[1] != etag
+
+
+def test_registry_current_and_drop():
+    registry = SessionRegistry()
+    first = registry.start(GameEngine(live_prices=False))
+    second = registry.start(GameEngine(live_prices=False))
+    assert registry.get() is second and registry.get(first.game_id) is first
+    registry.drop(second.game_id)
+    assert registry.current is None and registry.get(second.game_id) is None
+    registry.drop(first.game_id)
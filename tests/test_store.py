@@ -0,0 +1,73 @@
+import random
+import sqlite3
+
+import pytest
+
+import store
+from engine import GameEngine
+from store import ResultsStore, connect
+
+
+def finished_game(seed):
+    random.seed(seed)
+    engine = GameEngine(live_prices=False)
+    while not engine.game_over:
+        engine.advance(1000)
+    return engine
+
+
+def count(path, table):
+    with connect(str(path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_finished_games_round_trip(tmp_path):
+    path = tmp_path / "results.db"
+    s = ResultsStore(str(path), rounds=True, ledger=False, flush_seconds=0.01)
+    engines = [finished_game(seed) for seed in (1, 2)]
+    for engine in engines:
+        s.record_tick(engine)
+        s.record_tick(engine)       # repeated end-of-game ticks write once
+    s.close()
+
+    assert count(path, "games") == 2
+    assert count(path, "results") == sum(len(e.bots) for e in engines)
+    board = s.leaderboard()
+    assert {row["bot_name"] for row in board} == {b.name for b in engines[0].bots}
+    assert all(row["games"] == 2 for row in board)
+    assert sum(row["wins"] for row in board) == 2
+    rates = s.personality_win_rates()
+    assert sum(row["wins"] for row in rates) == 2
+    with connect(str(path)) as conn:
+        top = conn.execute("SELECT bot_name, net_worth FROM results WHERE game_id = ? AND rank = 1",
+                           (engines[0].game_id,)).fetchone()
+    best = max(engines[0].bots, key=lambda b: b.net_worth())
+    assert top == (best.name, pytest.approx(best.net_worth()))
+
+
+def test_failed_flush_keeps_the_writer(tmp_path, monkeypatch):
+    path = tmp_path / "results.db"
+    s = ResultsStore(str(path), flush_seconds=0.01)
+    monkeypatch.setitem(store.INSERTS, "games", "INSERT INTO missing VALUES (?)")
+    s._put("games", [("bad",)])
+    monkeypatch.undo()
+    s.record_game(finished_game(3))
+    s.close()
+    assert count(path, "games") == 1
+
+
+def test_full_queue_drops_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "STORE_QUEUE_MAX", 1)
+    s = ResultsStore(str(tmp_path / "results.db"))
+    s.close()                       # writer gone, so the queue stays full
+    s._put("games", [("a",)])
+    s._put("games", [("b",)])       # dropped instead of blocking
+    assert s._queue.qsize() == 1
+
+
+def test_unopenable_store_is_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "_store", None)
+    monkeypatch.setattr(store, "STORE_PATH", str(tmp_path / "missing" / "results.db"))
+    assert store.get_store() is None
+    with pytest.raises(sqlite3.Error):
+        ResultsStore(store.STORE_PATH)
@@ -0,0 +1,112 @@
+"""Asset universes: the built-in five coins, a file-defined list, or a synthetic stress set.
+
+A universe file is JSON or CSV. JSON may be a list of asset objects or
+{"assets": [...], "events": [...]}; CSV needs symbol,name,price,volatility,trend
+columns. Asset and event fields match ASSETS_TEMPLATE / EVENT_POOL in config.py.
+"""
+
+import csv
+import json
+import random
+from dataclasses import dataclass, field
+
+from config import ASSETS_TEMPLATE, EVENT_POOL, ASSETS_FILE
+
+ASSET_FIELDS = ("symbol", "name", "price", "volatility", "trend")
+EVENT_FIELDS = ("name", "description", "target_asset", "price_impact", "duration")
+
+
+@dataclass
+class Universe:
+    assets: list = field(default_factory=list)
+    events: list = field(default_factory=list)
+
+
+def _asset(row: dict) -> dict:
+    missing = [k for k in ASSET_FIELDS if k not in row or row[k] in ("", None)]
+    if missing:
+        raise ValueError(f"asset {row.get('symbol', '?')!r} is missing {', '.join(missing)}")
+    return {
+        "symbol": str(row["symbol"]).upper(),
+        "name": str(row["name"]),
+        "price": float(row["price"]),
+        "volatility": float(row["volatility"]),
+        "trend": float(row["trend"]),
+    }
+
+
+def _event(row: dict) -> dict:
+    missing = [k for k in EVENT_FIELDS if k not in row]
+    if missing:
+        raise ValueError(f"event {row.get('name', '?')!r} is missing {', '.join(missing)}")
+    ev = {k: row[k] for k in EVENT_FIELDS}
+    ev["price_impact"] = float(ev["price_impact"])
+    ev["duration"] = int(ev["duration"])
+    if "delay" in row:
+        ev["delay"] = int(row["delay"])
+    if row.get("followup"):
+        ev["followup"] = _event(row["followup"])
+    return ev
+
+
+def load_universe(path: str) -> Universe:
+    """Read assets (and optional events) from a .json or .csv file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            return Universe(assets=[_asset(row) for row in csv.DictReader(f)], events=list(EVENT_POOL))
+
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"assets": data}
+    assets = [_asset(row) for row in data.get("assets", [])]
+    events = [_event(row) for row in data.get("events", [])] or list(EVENT_POOL)
+    if not assets:
+        raise ValueError(f"{path}: no assets defined")
+    return Universe(assets=assets, events=events)
+
+
+def synthetic_universe(n_assets: int, events_per_asset: int = 2, seed: int | None = None) -> Universe:
+    """n random assets plus targeted events, for stress tests and benchmarks."""
+    rng = random.Random(seed)
+    assets, events = [], []
+    for i in range(n_assets):
+        sym = f"A{i:04d}"
+        assets.append({
+            "symbol": sym,
+            "name": f"Asset {i}",
+            "price": round(10 ** rng.uniform(0, 4), 2),
+            "volatility": round(rng.uniform(0.2, 0.9), 2),
+            "trend": round(rng.uniform(-0.2, 0.2), 2),
+        })
+        for j in range(events_per_asset):
+            impact = round(rng.choice((-1, 1)) * rng.uniform(0.03, 0.12), 3)
+            events.append({
+                "name": f"{sym} {'PUMP' if impact > 0 else 'DUMP'} {j}",
+                "description": f"Something is happening with {sym}.",
+                "target_asset": sym,
+                "price_impact": impact,
+                "duration": rng.randint(1, 3),
+            })
+    events.extend(ev for ev in EVENT_POOL if ev["target_asset"] == "ALL")
+    return Universe(assets=assets, events=events)
+
+
+_default = None
+
+
+def default_universe() -> Universe:
+    """ASSETS_FILE if configured, otherwise the built-in templates. Loaded once.
+
+    A configured file that cannot be read is an error, not a silent fallback.
+    """
+    global _default
+    if _default is None:
+        if ASSETS_FILE:
+            try:
+                _default = load_universe(ASSETS_FILE)
+            except OSError as e:
+                raise ValueError(f"ASSETS_FILE {ASSETS_FILE!r}: {e.strerror}") from e
+        else:
+            _default = Universe(assets=list(ASSETS_TEMPLATE), events=list(EVENT_POOL))
+    return _default